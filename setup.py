@@ -35,8 +35,11 @@ setup(
         'Programming Language :: Python :: 3.6',
         'Framework :: Robot Framework :: Library',
     ],
-    py_modules = ['TestRailAPIClient', 'TestRailListener', 'TestRailPreRunModifier'],
+    py_modules = ['TestRailAPIClient', 'TestRailListener', 'TestRailPreRunModifier', 'TestRailTrendExport'],
     keywords='testing testautomation robotframework testrail',
     package_dir={'': 'src'},
     install_requires=requirements,
+    entry_points={
+        'console_scripts': ['testrail-trend-export=TestRailTrendExport:main'],
+    },
 )
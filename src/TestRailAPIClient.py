@@ -1,16 +1,121 @@
 # -*- coding: utf-8 -*-
 
-from requests import post, get
-from typing import Any, cast, Dict, List, Optional, Sequence, Union
+import re
 
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from typing import Any, cast, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+TESTRAIL_API_URL = '{protocol}://{server}/testrail/index.php?/api/v2/'
 DEFAULT_TESTRAIL_HEADERS = {'Content-Type': 'application/json'}
+CONNECTION_POOL_SIZE = 32  # Max number of kept-alive connections to TestRail, used by concurrent requests
 TESTRAIL_STATUS_ID_PASSED = 1
+TESTRAIL_STATUS_ID_UNTESTED = 3
+TESTRAIL_RUN_ID_ENV_VAR = 'TESTRAIL_RUN_ID'  # Environment variable with ID of the test run created by pre-run modifier
 
 # custom types
 JsonDict = Dict[str, Any]  # noqa: E993
 JsonList = List[JsonDict]  # noqa: E993
 Id = Union[str, int]  # noqa: E993
 
+TESTRAIL_ID_TAG_PREFIX = 'testrailid='
+TIME_SPAN_UNITS = {'w': 60 * 60 * 24 * 7, 'd': 60 * 60 * 24, 'h': 60 * 60, 'm': 60, 's': 1}
+
+
+def time_span_to_seconds(time_span: Optional[str]) -> int:
+    """Convert TestRail time span to seconds.
+
+    *Args:* \n
+        _time_span_ - time span in TestRail format, e.g. "30s" or "1m 45s".
+
+    *Returns:* \n
+        Time in seconds, zero if time span is empty or can't be parsed.
+    """
+    if not time_span:
+        return 0
+    return sum(int(value) * TIME_SPAN_UNITS[unit]
+               for value, unit in re.findall(r'(\d+)\s*([wdhms])', str(time_span).lower()))
+
+
+def get_case_ids_from_tags(tags: Sequence[str]) -> List[str]:
+    """Get TestRail case IDs from 'testrailid' tags.
+
+    Several case IDs can be set either in one comma-separated tag or in repeated tags,
+    e.g. "testrailid=10,11" or "testrailid=10" and "testrailid=11".
+
+    *Args:* \n
+        _tags_ - list of Robot Framework test tags.
+
+    *Returns:* \n
+        List of unique case IDs in the order of the tags.
+    """
+    case_ids = [case_id.strip() for tag in tags if tag.startswith(TESTRAIL_ID_TAG_PREFIX)
+                for case_id in tag[len(TESTRAIL_ID_TAG_PREFIX):].split(',')]
+    return list(dict.fromkeys(case_id for case_id in case_ids if case_id))
+
+
+class TestRecord(object):
+    """Compact record of the test of TestRail test run."""
+
+    __slots__ = ('id', 'case_id', 'status_id')
+
+    def __init__(self, id: int, case_id: Optional[int], status_id: int) -> None:
+        """Create TestRecord instance.
+
+        *Args:* \n
+            _id_ - ID of the test;\n
+            _case_id_ - ID of the test case;\n
+            _status_id_ - ID of the test status.
+        """
+        self.id = id
+        self.case_id = case_id
+        self.status_id = status_id
+
+    @classmethod
+    def from_json(cls, test: JsonDict) -> 'TestRecord':
+        """Create record from test information in json format.
+
+        *Args:* \n
+            _test_ - test information in json format.
+
+        *Returns:* \n
+            Test record.
+        """
+        return cls(test['id'], test['case_id'], test['status_id'])
+
+
+class ResultRecord(object):
+    """Compact record of the test result of TestRail test run."""
+
+    __slots__ = ('test_id', 'status_id', 'elapsed')
+
+    def __init__(self, test_id: int, status_id: Optional[int], elapsed: int) -> None:
+        """Create ResultRecord instance.
+
+        *Args:* \n
+            _test_id_ - ID of the test;\n
+            _status_id_ - ID of the result status, None for comments without status;\n
+            _elapsed_ - elapsed time in seconds.
+        """
+        self.test_id = test_id
+        self.status_id = status_id
+        self.elapsed = elapsed
+
+    @classmethod
+    def from_json(cls, result: JsonDict) -> 'ResultRecord':
+        """Create record from test result information in json format.
+
+        *Args:* \n
+            _result_ - test result information in json format.
+
+        *Returns:* \n
+            Result record.
+        """
+        return cls(result['test_id'], result['status_id'], time_span_to_seconds(result.get('elapsed')))
+
 
 class TestRailAPIClient(object):
     """Library for working with [http://www.gurock.com/testrail/ | TestRail].
@@ -32,10 +137,21 @@ class TestRailAPIClient(object):
             _run_id_ - ID of the test run;\n
             _protocol_ - connecting protocol to TestRail server: http or https.
         """
-        self._url = '{protocol}://{server}/testrail/index.php?/api/v2/'.format(protocol=protocol, server=server)
+        self._url = TESTRAIL_API_URL.format(protocol=protocol, server=server)
         self._user = user
         self._password = password
         self.run_id = run_id
+        self._session = Session()
+        self._session.auth = (user, password)
+        self._session.verify = False
+        adapter = HTTPAdapter(pool_maxsize=CONNECTION_POOL_SIZE)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._statuses: Optional[JsonList] = None
+        self._test_records: Dict[str, List[TestRecord]] = {}
+        self._test_records_versions: Dict[str, int] = {}
+        self._test_records_lock = Lock()
+        self._case_fields: Optional[JsonList] = None
 
     def _send_post(self, uri: str, data: Dict[str, Any]) -> Union[JsonList, JsonDict]:
         """Perform post request to TestRail.
@@ -48,7 +164,7 @@ class TestRailAPIClient(object):
             Request result in json format.
         """
         url = self._url + uri
-        response = post(url, json=data, auth=(self._user, self._password), verify=False)
+        response = self._session.post(url, json=data)
         response.raise_for_status()
         return response.json()
 
@@ -65,19 +181,50 @@ class TestRailAPIClient(object):
             Request result in json format.
         """
         url = self._url + uri
-        response = get(url, headers=headers, params=params, auth=(self._user, self._password), verify=False)
+        response = self._session.get(url, headers=headers, params=params)
         response.raise_for_status()
         return response.json()
 
-    def get_tests(self, run_id: Id, status_ids: Union[str, Sequence[int]] = None) -> JsonList:
-        """Get tests from TestRail test run by run_id.
+    def _send_get_paginated(self, uri: str, key: str, params: Dict[str, Any] = None) -> Iterator[JsonDict]:
+        """Perform get requests to TestRail for all pages of bulk endpoint.
+
+        TestRail 6.7 and later returns results of bulk endpoints by pages with a link to the next page,
+        earlier versions return the whole list at once.
+
+        *Args:* \n
+            _uri_ - URI of bulk endpoint;\n
+            _key_ - key of the items list in the page;\n
+            _params_ - parameters for http-request, _limit_ parameter limits total number of items.
+
+        *Returns:* \n
+            Iterator of items in json format.
+        """
+        params = dict(params or {})
+        limit = params.get('limit')
+        count = 0
+        while True:
+            response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS, params=params)
+            if isinstance(response, list):
+                yield from response
+                return
+            items = response[key]
+            yield from items
+            count += len(items)
+            if not items or not (response.get('_links') or {}).get('next') or (limit and count >= int(limit)):
+                return
+            params['offset'] = response['offset'] + len(items)
+            if limit:
+                params['limit'] = int(limit) - count
+
+    def _iter_tests(self, run_id: Id, status_ids: Union[str, Sequence[int]] = None) -> Iterator[JsonDict]:
+        """Iterate over tests of TestRail test run page by page.
 
         *Args:* \n
             _run_id_ - ID of the test run;\n
             _status_ids_ - list of the required test statuses.
 
         *Returns:* \n
-            Tests information in json format.
+            Iterator of tests information in json format.
         """
         uri = 'get_tests/{run_id}'.format(run_id=run_id)
         if status_ids:
@@ -85,26 +232,168 @@ class TestRailAPIClient(object):
         params = {
             'status_id': status_ids
         }
-        response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS, params=params)
-        return cast(JsonList, response)
+        return self._send_get_paginated(uri=uri, key='tests', params=params)
 
-    def get_results_for_case(self, run_id: Id, case_id: Id, limit: int = None) -> JsonList:
-        """Get results for case by run_id and case_id.
+    def _iter_results(self, run_id: Id, case_id: Id = None, status_ids: Union[str, Sequence[int]] = None,
+                      limit: int = None, created_before: Id = None) -> Iterator[JsonDict]:
+        """Iterate over results of TestRail test run or of one case in it page by page.
 
         *Args:* \n
             _run_id_ - ID of the test run;\n
-            _case_id_ - ID of the test case;\n
-            _limit_ - limit of case results.
+            _case_id_ - ID of the test case, results of all tests of the test run if None;\n
+            _status_ids_ - list of the required result statuses;\n
+            _limit_ - limit of results;\n
+            _created_before_ - UNIX timestamp to get only the results of the test run created before it.
 
         *Returns:* \n
-            Cases results in json format.
+            Iterator of results in json format, from the most recent to the oldest one.
         """
-        uri = 'get_results_for_case/{run_id}/{case_id}'.format(run_id=run_id, case_id=case_id)
+        if case_id is None:
+            uri = 'get_results_for_run/{run_id}'.format(run_id=run_id)
+        else:
+            uri = 'get_results_for_case/{run_id}/{case_id}'.format(run_id=run_id, case_id=case_id)
+        if status_ids:
+            status_ids = ','.join(str(status_id) for status_id in status_ids)
         params = {
+            'status_id': status_ids,
             'limit': limit
         }
-        response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS, params=params)
-        return cast(JsonList, response)
+        if created_before is not None:
+            params['created_before'] = created_before
+        return self._send_get_paginated(uri=uri, key='results', params=params)
+
+    @staticmethod
+    def _project(items: Iterable[JsonDict], fields: Optional[Sequence[str]]) -> JsonList:
+        """Leave only the required fields in the items.
+
+        *Args:* \n
+            _items_ - items in json format;\n
+            _fields_ - names of the required fields, all fields are left if None.
+
+        *Returns:* \n
+            List of items in json format.
+        """
+        if fields is None:
+            return list(items)
+        return [{field: item.get(field) for field in fields} for item in items]
+
+    def get_tests(self, run_id: Id, status_ids: Union[str, Sequence[int]] = None,
+                  fields: Sequence[str] = None) -> JsonList:
+        """Get tests from TestRail test run by run_id.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _status_ids_ - list of the required test statuses;\n
+            _fields_ - names of the required fields of the tests, all fields by default.
+
+        *Returns:* \n
+            Tests information in json format.
+
+        *Example:*\n
+        | Get Tests | run_id=321 | fields=${{['case_id', 'status_id']}} |
+        """
+        return self._project(self._iter_tests(run_id, status_ids), fields)
+
+    def get_results_for_case(self, run_id: Id, case_id: Id, limit: int = None,
+                             fields: Sequence[str] = None) -> JsonList:
+        """Get results for case by run_id and case_id.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _case_id_ - ID of the test case;\n
+            _limit_ - limit of case results;\n
+            _fields_ - names of the required fields of the results, all fields by default.
+
+        *Returns:* \n
+            Cases results in json format.
+        """
+        return self._project(self._iter_results(run_id, case_id, limit=limit), fields)
+
+    def get_results_for_run(self, run_id: Id, status_ids: Union[str, Sequence[int]] = None,
+                            limit: int = None, fields: Sequence[str] = None) -> JsonList:
+        """Get results for all tests of the test run by run_id.
+
+        Results are sorted from the most recent to the oldest one.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _status_ids_ - list of the required result statuses;\n
+            _limit_ - limit of run results;\n
+            _fields_ - names of the required fields of the results, all fields by default.
+
+        *Returns:* \n
+            Run results in json format.
+
+        *Example:*\n
+        | ${results}= | Get Results For Run | run_id=321 | status_ids=${{[4, 5]}} | fields=${{['test_id', 'status_id']}} |
+        """
+        return self._project(self._iter_results(run_id, status_ids=status_ids, limit=limit), fields)
+
+    def get_test_records(self, run_id: Id, status_ids: Union[str, Sequence[int]] = None,
+                         cache: bool = True) -> List[TestRecord]:
+        """Get compact records of the tests from TestRail test run by run_id.
+
+        Unlike `Get Tests` only test ID, case ID and status ID are kept, other fields are dropped page by page.
+        All tests of the test run are requested once and cached until results are added to the test run
+        or it's updated, tests with the required statuses are selected from the cached records.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _status_ids_ - list of the required test statuses;\n
+            _cache_ - indicator to cache the tests of the test run; if false, then only the tests
+            with the required statuses are requested and they aren't kept by the client.
+
+        *Returns:* \n
+            List of test records.
+        """
+        if not cache:
+            return [TestRecord.from_json(test) for test in self._iter_tests(run_id, status_ids)]
+        tests = self._test_records.get(str(run_id))
+        if tests is None:
+            version = self._test_records_versions.get(str(run_id), 0)
+            tests = [TestRecord.from_json(test) for test in self._iter_tests(run_id)]
+            with self._test_records_lock:
+                if version == self._test_records_versions.get(str(run_id), 0):
+                    self._test_records[str(run_id)] = tests
+        if not status_ids:
+            return list(tests)
+        if isinstance(status_ids, str):
+            status_ids = [int(status_id) for status_id in status_ids.split(',')]
+        required_status_ids = {int(status_id) for status_id in status_ids}
+        return [test for test in tests if test.status_id in required_status_ids]
+
+    def get_result_records(self, run_id: Id, case_id: Id = None, status_ids: Union[str, Sequence[int]] = None,
+                           limit: int = None, created_before: Id = None) -> List[ResultRecord]:
+        """Get compact records of the results of the test run or of one case in it.
+
+        Unlike `Get Results For Run` only test ID, status ID and elapsed time are kept,
+        other fields are dropped page by page.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _case_id_ - ID of the test case, results of all tests of the test run if None;\n
+            _status_ids_ - list of the required result statuses;\n
+            _limit_ - limit of results;\n
+            _created_before_ - UNIX timestamp to get only the results created before it,
+            supported only for the results of all tests of the test run.
+
+        *Returns:* \n
+            List of result records from the most recent to the oldest one.
+        """
+        results = self._iter_results(run_id, case_id, status_ids, limit, created_before)
+        return [ResultRecord.from_json(result) for result in results]
+
+    def _invalidate_test_records(self, run_id: Id) -> None:
+        """Drop cached tests of the test run after it's changed.
+
+        Tests that are being requested concurrently with the change aren't cached either.
+
+        *Args:* \n
+            _run_id_ - ID of the test run.
+        """
+        with self._test_records_lock:
+            self._test_records_versions[str(run_id)] = self._test_records_versions.get(str(run_id), 0) + 1
+            self._test_records.pop(str(run_id), None)
 
     def add_result_for_case(self, run_id: Id, case_id: Id,
                             test_result_fields: Dict[str, Union[str, int]]) -> None:
@@ -129,17 +418,59 @@ class TestRailAPIClient(object):
         | Add Result For Case | run_id=321 | case_id=123| test_result={'status_id': 3, 'comment': 'This test is untested', 'defects': 'DEF-123'} |
         """
         uri = 'add_result_for_case/{run_id}/{case_id}'.format(run_id=run_id, case_id=case_id)
-        self._send_post(uri, test_result_fields)
+        try:
+            self._send_post(uri, test_result_fields)
+        finally:
+            self._invalidate_test_records(run_id)
+
+    def add_results_for_cases(self, run_id: Id, results: Sequence[Dict[str, Union[str, int]]]) -> JsonList:
+        """Add results for several cases in TestRail test run by run_id with one request.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _results_ - list of test result fields dictionaries, each of them must contain _case_id_ field.
+            Supported fields are the same as for `Add Result For Case`.
+
+        *Returns:* \n
+            Added test results in json format.
+
+        *Example:*\n
+        | Add Results For Cases | run_id=321 | results=[{'case_id': 123, 'status_id': 1}, {'case_id': 124, 'status_id': 5}] |
+        """
+        uri = 'add_results_for_cases/{run_id}'.format(run_id=run_id)
+        try:
+            response = self._send_post(uri, {'results': list(results)})
+        finally:
+            self._invalidate_test_records(run_id)
+        return cast(JsonList, response)
 
     def get_statuses(self) -> JsonList:
         """Get test statuses information from TestRail.
 
+        Statuses are requested once and then cached values are returned.
+
         *Returns:* \n
             Statuses information in json format.
         """
-        uri = 'get_statuses'
-        response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS)
-        return cast(JsonList, response)
+        if self._statuses is None:
+            uri = 'get_statuses'
+            response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS)
+            self._statuses = cast(JsonList, response)
+        return self._statuses
+
+    def get_case_fields(self) -> JsonList:
+        """Get test case custom fields information from TestRail.
+
+        Case fields are requested once and then cached values are returned.
+
+        *Returns:* \n
+            Case fields information in json format.
+        """
+        if self._case_fields is None:
+            uri = 'get_case_fields'
+            response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS)
+            self._case_fields = cast(JsonList, response)
+        return self._case_fields
 
     def update_case(self, case_id: Id, request_fields: Dict[str, Union[str, int, None]]) -> JsonDict:
         """Update an existing test case in TestRail.
@@ -198,6 +529,99 @@ class TestRailAPIClient(object):
         last_case_result = self.get_results_for_case(run_id=run_id, case_id=case_id, limit=1)
         return last_case_result[0]['status_id'] if last_case_result else None
 
+    def add_run(self, project_id: Id, name: str, case_ids: Sequence[Id], suite_id: Id = None,
+                description: str = None, include_all: bool = False) -> JsonDict:
+        """Creates a new test run.
+
+        *Args:* \n
+            _project_id_ - ID of the project;\n
+            _name_ - name of the test run;\n
+            _case_ids_ - IDs of the test cases to include in the test run;\n
+            _suite_id_ - ID of the test suite (optional if the project is operating in single suite mode);\n
+            _description_ - description of the test run;\n
+            _include_all_ - include all test cases of the test suite instead of the given ones.
+
+        *Returns:* \n
+            New test run information.
+
+        *Example:*\n
+        | Add Run | project_id=1 | name=Nightly | case_ids=${case_ids} |
+        """
+        uri = 'add_run/{project_id}'.format(project_id=project_id)
+        data: Dict[str, Any] = {'name': name, 'include_all': include_all, 'case_ids': list(case_ids)}
+        if suite_id is not None:
+            data['suite_id'] = suite_id
+        if description is not None:
+            data['description'] = description
+
+        response = self._send_post(uri=uri, data=data)
+        return cast(JsonDict, response)
+
+    def update_run(self, run_id: Id, case_ids: Sequence[Id], include_all: bool = False) -> JsonDict:
+        """Updates the set of test cases of an existing test run.
+
+        Results of the test cases that are not in _case_ids_ are removed from the test run.
+
+        *Args:* \n
+            _run_id_ - ID of the test run;\n
+            _case_ids_ - IDs of the test cases to include in the test run;\n
+            _include_all_ - include all test cases of the test suite instead of the given ones.
+
+        *Returns:* \n
+            Test run information.
+        """
+        uri = 'update_run/{run_id}'.format(run_id=run_id)
+        data = {'include_all': include_all, 'case_ids': list(case_ids)}
+        try:
+            response = self._send_post(uri=uri, data=data)
+        finally:
+            self._invalidate_test_records(run_id)
+        return cast(JsonDict, response)
+
+    def get_plan(self, plan_id: Id) -> JsonDict:
+        """Get test plan info with its entries and test runs by plan id.
+
+        *Args:* \n
+            _plan_id_ - ID of the test plan.
+
+        *Returns:* \n
+            Request result in json format.
+        """
+        uri = 'get_plan/{plan_id}'.format(plan_id=plan_id)
+        response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS)
+        return cast(JsonDict, response)
+
+    def get_plan_run_ids(self, plan_id: Id, configs: Union[str, Sequence[str]] = None) -> List[int]:
+        """Get IDs of the test runs of all entries of the test plan.
+
+        Test runs can be selected by their configurations: names or IDs of configurations of one combination
+        are separated by comma, combinations are separated by "|". A test run is selected if it has all
+        configurations of any combination, e.g. "Chrome" selects all test runs with Chrome,
+        "Chrome,Windows|Firefox,Linux" selects test runs with Chrome on Windows and with Firefox on Linux.
+
+        *Args:* \n
+            _plan_id_ - ID of the test plan;\n
+            _configs_ - configurations selector, all test runs of the test plan if None.
+
+        *Returns:* \n
+            List of test run IDs.
+
+        *Example:*\n
+        | ${run_ids}= | Get Plan Run Ids | plan_id=5 | configs=Chrome,Windows|Firefox |
+        """
+        if isinstance(configs, str):
+            configs = configs.split('|')
+        combinations = [{config.strip().lower() for config in combination.split(',') if config.strip()}
+                        for combination in configs or []]
+        run_ids = []
+        for entry in self.get_plan(plan_id).get('entries', []):
+            for run in entry['runs']:
+                run_configs = {config.strip().lower() for config in (run.get('config') or '').split(',')}
+                run_configs.update(str(config_id) for config_id in run.get('config_ids') or [])
+                if not combinations or any(combination <= run_configs for combination in combinations):
+                    run_ids.append(run['id'])
+        return run_ids
+
     def get_project(self, project_id: Id) -> JsonDict:
         """Get project info by project id.
 
@@ -290,26 +714,78 @@ class TestRailAPIClient(object):
         response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS)
         return cast(JsonDict, response)
 
-    def get_cases(self, project_id: Id, suite_id: Id = None, section_id: Id = None) -> JsonList:
+    def get_cases(self, project_id: Id, suite_id: Id = None, section_id: Id = None, **filters: Any) -> JsonList:
         """Returns a list of test cases for a test suite or specific section in a test suite.
 
+        All pages of test cases are requested, so the list is complete for any number of test cases.
+
+        *Behavior change:* on TestRail 6.7 and later the keyword used to return the first page of test cases,
+        a dictionary with the test cases in "cases" key, now it returns the list of all test cases,
+        the same as on earlier TestRail versions. Suites that read ${cases['cases']} must use ${cases} instead.
+
+        *Supported filters:*\n
+        | *Name*         | *Type*    | *Description*                                                    |
+        | created_after  | timestamp | Only return test cases created after this date (as UNIX timestamp) |
+        | created_before | timestamp | Only return test cases created before this date (as UNIX timestamp) |
+        | created_by     | list      | A comma-separated list of creators (user IDs) to filter by         |
+        | filter         | string    | Only return cases with matching filter string in the case title    |
+        | milestone_id   | list      | A comma-separated list of milestone IDs to filter by               |
+        | priority_id    | list      | A comma-separated list of priority IDs to filter by                |
+        | refs           | string    | A single Reference ID (e.g. TR-1, 4291, etc.)                       |
+        | template_id    | list      | A comma-separated list of template IDs to filter by                |
+        | type_id        | list      | A comma-separated list of case type IDs to filter by               |
+        | updated_after  | timestamp | Only return test cases updated after this date (as UNIX timestamp) |
+        | updated_before | timestamp | Only return test cases updated before this date (as UNIX timestamp) |
+        | updated_by     | list      | A comma-separated list of users who updated test cases to filter by |
+        | limit          | int       | Limit of test cases                                                |
+
         *Args:* \n
             _project_id_ - ID of the project;\n
             _suite_id_ - ID of the test suite (optional if the project is operating in single suite mode);\n
-            _section_id_ - ID of the section (optional).
+            _section_id_ - ID of the section (optional);\n
+            _filters_ - filters of test cases, lists may be passed as well as comma-separated strings.
 
         *Returns:* \n
             Information about test cases in section.
+
+        *Example:*\n
+        | ${cases}= | Get Cases | project_id=1 | suite_id=2 | type_id=1,3 | priority_id=${{[3, 4]}} |
         """
         uri = 'get_cases/{project_id}'.format(project_id=project_id)
-        params = {'project_id': project_id}
+        params: Dict[str, Any] = {'project_id': project_id}
         if suite_id is not None:
             params['suite_id'] = suite_id
         if section_id is not None:
             params['section_id'] = section_id
+        for name, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                value = ','.join(str(item) for item in value)
+            params[name] = value
 
-        response = self._send_get(uri=uri, headers=DEFAULT_TESTRAIL_HEADERS, params=params)
-        return cast(JsonList, response)
+        return list(self._send_get_paginated(uri=uri, key='cases', params=params))
+
+    def update_cases(self, cases_fields: Dict[Id, Dict[str, Union[str, int, None]]],
+                     max_workers: int = None) -> JsonList:
+        """Update several existing test cases in TestRail concurrently.
+
+        Each test case is updated with its own request fields, requests are sent in parallel
+        through the pooled connections of the client.
+        Supported request fields are the same as for `Update Case`.
+
+        *Args:* \n
+            _cases_fields_ - dictionary of request fields dictionaries by case ID;\n
+            _max_workers_ - number of concurrent requests, the default of ThreadPoolExecutor if None.
+
+        *Returns:* \n
+            List of cases information in json format in the order of _cases_fields_.
+
+        *Example:*\n
+        | Update Cases | cases_fields={213: {'title': 'First'}, 214: {'title': 'Second', 'refs': 'REF-1'}} |
+        """
+        with ThreadPoolExecutor(max_workers=int(max_workers) if max_workers else None) as executor:
+            futures = [executor.submit(self.update_case, case_id, request_fields)
+                       for case_id, request_fields in cases_fields.items()]
+        return [future.result() for future in futures]
 
     def add_case(self, section_id: Id, title: str, steps: List[Dict[str, str]], description: str, refs: str,
                  type_id: Id, priority_id: Id, **additional_data: Any) -> JsonDict:
@@ -342,3 +818,56 @@ class TestRailAPIClient(object):
 
         response = self._send_post(uri=uri, data=data)
         return cast(JsonDict, response)
+
+
+_shared_clients: Dict[Tuple[str, str, str], TestRailAPIClient] = {}
+_shared_clients_lock = Lock()
+
+
+def get_shared_client(server: str, user: str, password: str, run_id: Id, protocol: str = 'http') -> TestRailAPIClient:
+    """Get TestRailAPIClient instance shared in the process by server, user and test run.
+
+    Pre-run modifier and listener of the same test run get the same client, so its connection pool
+    and cached statuses, case fields and tests of the test run are requested only once.
+
+    *Args:* \n
+        _server_ - name of TestRail server;\n
+        _user_ - name of TestRail user;\n
+        _password_ - password of TestRail user;\n
+        _run_id_ - ID of the test run;\n
+        _protocol_ - connecting protocol to TestRail server: http or https.
+
+    *Returns:* \n
+        Shared TestRailAPIClient instance.
+    """
+    key = (TESTRAIL_API_URL.format(protocol=protocol, server=server), user, str(run_id))
+    with _shared_clients_lock:
+        client = _shared_clients.get(key)
+        if client is None or client._password != password:
+            client = TestRailAPIClient(server, user, password, run_id, protocol)
+            _shared_clients[key] = client
+        return client
+
+
+def share_client(client: TestRailAPIClient) -> None:
+    """Share TestRailAPIClient instance in the process by its server, user and current test run.
+
+    Used when the test run of the client is changed, e.g. after the test run is created.
+
+    *Args:* \n
+        _client_ - TestRailAPIClient instance.
+    """
+    with _shared_clients_lock:
+        _shared_clients[_get_shared_client_key(client)] = client
+
+
+def _get_shared_client_key(client: TestRailAPIClient) -> Tuple[str, str, str]:
+    """Get key of the shared client.
+
+    *Args:* \n
+        _client_ - TestRailAPIClient instance.
+
+    *Returns:* \n
+        Tuple of API URL, user name and test run ID.
+    """
+    return client._url, client._user, str(client.run_id)
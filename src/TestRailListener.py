@@ -1,16 +1,217 @@
 # -*- coding: utf-8 -*-
 
+import cProfile
+import heapq
+import io
 import json
+import math
+import pstats
 import re
 import requests
 import os
-from typing import Any, Dict, List, Optional, Union
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, cast, DefaultDict, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
 from robot.api import logger
-from TestRailAPIClient import JsonDict, TestRailAPIClient
+from TestRailAPIClient import JsonDict, TestRecord, TESTRAIL_RUN_ID_ENV_VAR, \
+    TESTRAIL_STATUS_ID_UNTESTED, get_case_ids_from_tags, get_shared_client
 
 __author__ = "Dmitriy.Zverev"
 __license__ = "Apache License, Version 2.0"
 
+Function = TypeVar('Function', bound=Callable[..., Any])
+
+
+class ListenerProfiler(object):
+    """Collects wall time of the phases of the listener and writes report with their percentiles.
+
+    Time is measured by monotonic clock. If profiler is disabled, nothing is measured.
+    Call stacks statistics are collected by cProfile only for a sample of the tests,
+    time of the sampled tests is excluded from the phases statistics, since it's inflated by tracing.
+    """
+
+    PERCENTILES = (50, 90, 99)
+    SLOWEST_TESTS_COUNT = 10
+    STACK_LINES_COUNT = 25
+    STACKS_SAMPLE_INTERVAL = 10  # Call stacks statistics are collected for every n-th test, starting from the first
+
+    def __init__(self, enabled: bool = False, stacks_count: int = 0) -> None:
+        """Profiler initialization.
+
+        *Args:*\n
+            _enabled_ - indicator to measure time;\n
+            _stacks_count_ - number of the slowest sampled tests to keep call stacks statistics for.
+        """
+        self.enabled = enabled
+        self.stacks_count = stacks_count
+        self._tests_count = 0
+        self._is_sampled = False
+        self._timings: DefaultDict[str, List[float]] = defaultdict(list)
+        self._slowest_tests: List[Tuple[float, str]] = []
+        self._slowest_stacks: List[Tuple[float, str, str]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure time of the phase.
+
+        *Args:*\n
+            _name_ - name of the phase.
+        """
+        if not self.enabled or self._is_sampled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[name].append(time.perf_counter() - start)
+
+    @contextmanager
+    def test(self, test_name: str) -> Iterator[None]:
+        """Measure total time of the listener for the test, or collect its call stacks statistics if it's sampled.
+
+        *Args:*\n
+            _test_name_ - long name of the test.
+        """
+        if not self.enabled:
+            yield
+            return
+        self._tests_count += 1
+        profile = self._start_profile() if self.stacks_count else None
+        self._is_sampled = profile is not None
+        start = time.perf_counter()
+        try:
+            with self.phase('total'):
+                yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._is_sampled = False
+            if profile is not None:
+                profile.disable()
+                self._keep_slowest_stacks(elapsed, test_name, profile)
+            else:
+                self._keep_slowest(elapsed, test_name)
+
+    def _start_profile(self) -> Optional[cProfile.Profile]:
+        """Start collecting call stacks statistics if the current test is sampled.
+
+        If profiling can't be started (e.g. another profiler is active), call stacks statistics are disabled.
+
+        *Returns:*\n
+            Started profile, None if the test isn't sampled.
+        """
+        if (self._tests_count - 1) % self.STACKS_SAMPLE_INTERVAL:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as error:
+            logger.warn(f"[TestRailListener] call stacks statistics are disabled: {error}")
+            self.stacks_count = 0
+            return None
+        return profile
+
+    def _keep_slowest(self, elapsed: float, test_name: str) -> None:
+        """Keep the test if it's one of the slowest ones.
+
+        *Args:*\n
+            _elapsed_ - total time of the listener for the test in seconds;\n
+            _test_name_ - long name of the test.
+        """
+        if len(self._slowest_tests) < self.SLOWEST_TESTS_COUNT:
+            heapq.heappush(self._slowest_tests, (elapsed, test_name))
+        else:
+            heapq.heappushpop(self._slowest_tests, (elapsed, test_name))
+
+    def _keep_slowest_stacks(self, elapsed: float, test_name: str, profile: cProfile.Profile) -> None:
+        """Keep call stacks statistics of the sampled test if it's one of the slowest ones.
+
+        *Args:*\n
+            _elapsed_ - total time of the listener for the test with profiling in seconds;\n
+            _test_name_ - long name of the test;\n
+            _profile_ - call stacks statistics of the test.
+        """
+        if len(self._slowest_stacks) < self.stacks_count:
+            heapq.heappush(self._slowest_stacks, (elapsed, test_name, self._format_stacks(profile)))
+        elif elapsed > self._slowest_stacks[0][0]:
+            heapq.heapreplace(self._slowest_stacks, (elapsed, test_name, self._format_stacks(profile)))
+
+    def _format_stacks(self, profile: cProfile.Profile) -> str:
+        """Format call stacks statistics sorted by cumulative time.
+
+        *Args:*\n
+            _profile_ - call stacks statistics.
+
+        *Returns:*\n
+            Statistics in text format.
+        """
+        stream = io.StringIO()
+        pstats.Stats(profile, stream=stream).sort_stats('cumulative').print_stats(self.STACK_LINES_COUNT)
+        return stream.getvalue()
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], percent: int) -> float:
+        """Get percentile of the values by nearest-rank method.
+
+        *Args:*\n
+            _sorted_values_ - sorted values;\n
+            _percent_ - percent of the percentile.
+
+        *Returns:*\n
+            Percentile value.
+        """
+        rank = max(math.ceil(percent * len(sorted_values) / 100), 1)
+        return sorted_values[min(rank, len(sorted_values)) - 1]
+
+    def report(self) -> str:
+        """Get report with time of the phases and the slowest tests.
+
+        *Returns:*\n
+            Report in text format.
+        """
+        percentiles_header = ''.join(f'{"p" + str(percent) + " ms":>10}' for percent in self.PERCENTILES)
+        lines = [f'{"phase":<16}{"count":>8}{"total s":>10}{percentiles_header}{"max ms":>10}']
+        for name, timings in sorted(self._timings.items(), key=lambda item: -sum(item[1])):
+            timings = sorted(timings)
+            percentiles = ''.join(f'{self._percentile(timings, percent) * 1000:>10.1f}' for percent in self.PERCENTILES)
+            lines.append(f'{name:<16}{len(timings):>8}{sum(timings):>10.3f}{percentiles}{timings[-1] * 1000:>10.1f}')
+        lines.append('\nSlowest tests:')
+        lines.extend(f'{elapsed * 1000:>10.1f} ms  {test_name}'
+                     for elapsed, test_name in sorted(self._slowest_tests, reverse=True))
+        for elapsed, test_name, stacks in sorted(self._slowest_stacks, reverse=True):
+            lines.append(f'\nCall stacks of {test_name} ({elapsed * 1000:.1f} ms with profiling):\n{stacks}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """Write report to the file.
+
+        *Args:*\n
+            _path_ - path to the report file.
+        """
+        with open(path, 'w', encoding='utf-8') as report_file:
+            report_file.write(self.report())
+
+
+def profile_phase(name: str) -> Callable[[Function], Function]:
+    """Decorator to measure time of the listener method as the phase by listener profiler.
+
+    *Args:*\n
+        _name_ - name of the phase.
+
+    *Returns:*\n
+        Decorator.
+    """
+    def decorator(method: Function) -> Function:
+        @wraps(method)
+        def wrapper(self: 'TestRailListener', *args: Any, **kwargs: Any) -> Any:
+            with self._profiler.phase(name):
+                return method(self, *args, **kwargs)
+        return cast(Function, wrapper)
+    return decorator
+
 
 class TestRailListener(object):
     """Fixing of testing results and update test case in [ http://www.gurock.com/testrail/ | TestRail ].
@@ -40,6 +241,42 @@ class TestRailListener(object):
     | robot --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password:20:https:update  autotest.robot
     5. Test with case_id=10 will be marked as failed in TestRail with message "Test fail message" and defects "BUG-1, BUG-2".
     Also title, description and references of this test will be updated in TestRail. Parameter "update" is optional.
+    A test covering several test cases can have several IDs in "testrailid" tag, e.g. "testrailid=10,11",
+    or several "testrailid" tags. Results of all the test cases are posted with one request,
+    the test cases missing in the test run are skipped. With "update" option only the first test case is updated.
+    6. If run ID is empty, ID of the test run is taken from the environment variable TESTRAIL_RUN_ID,
+    e.g. the one created by TestRailPreRunModifier with "sync_run" option:
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password::http:0:sync_run=True:project_id=1
+    | --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password::https  autotest.robot
+    7. To post one result for all data-driven tests with the same "testrailid" tag, run listener with "aggregate" option:
+    | robot --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password:20:https:aggregate=True  autotest.robot
+    Results are posted with one request at the end of the run: the worst status of the tests,
+    their total time and a table with the result of each test in the comment.
+
+    8. To post results to the test runs of the test plan with id plan_id = 30, e.g. only to the Chrome ones:
+    | robot --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password::https:plan_id=30:configs=Chrome  autotest.robot
+    The test plan is requested once, every result is posted to all selected test runs containing its case.
+    Results are posted in batches, one request per test run at the end of each suite.
+    Configurations of one combination are separated by comma, combinations by "|", e.g. "Chrome,Windows|Firefox".
+    The listener argument with "|" must be quoted in the shell:
+    | robot --listener "TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password::https:plan_id=30:configs=Chrome,Windows|Firefox"  autotest.robot
+    If the test runs of the test plan can't be received, the results are kept until the next batch,
+    at the end of the run the results that still can't be routed are reported as errors.
+
+    9. To measure overhead of the listener, run it with "profile" option with path to the report file:
+    | robot --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password:20:https:profile=listener_profile.txt  autotest.robot
+    Report with percentiles of time of the listener phases (tags parsing, case update, status lookup,
+    result preparation, report link building, posting) and the slowest tests is written when the run is closed.
+    With "profile_stacks" option, e.g. "profile_stacks=3", call stacks statistics of the slowest tests are added.
+    They are collected by cProfile for every 10th test only, these tests are excluded from the time percentiles.
+
+    == Warm-up ==
+    When the root suite starts, tests of the test run and case fields are requested from TestRail
+    in background while the first tests are running. Once they are received, the latest statuses of the tests
+    are taken from memory instead of a request per test. Until then the listener requests them as usual,
+    so Robot Framework never waits for the warm-up.
+    The TestRail client is shared with TestRailPreRunModifier of the same server, user and test run,
+    so the data already requested by the modifier is taken from its cache.
     """
 
     ROBOT_LISTENER_API_VERSION = 2
@@ -47,20 +284,31 @@ class TestRailListener(object):
     TESTRAIL_CASE_TYPE_ID_AUTOMATED = 1
     TESTRAIL_TEST_STATUS_ID_PASSED = 1
     TESTRAIL_TEST_STATUS_ID_FAILED = 5
+    ROBOT_STATUSES_SEVERITY = {'PASS': 0, 'NOT RUN': 1, 'SKIP': 1, 'FAIL': 2}
+    AGGREGATED_MESSAGE_LENGTH = 100
+    PLAN_RESULTS_BATCH_SIZE = 50
 
     def __init__(self, server: str, user: str, password: str, run_id: str, protocol: str = 'http',
-                 juggler_disable: str = None, update: str = None) -> None:
+                 juggler_disable: str = None, update: str = None, aggregate: str = None, plan_id: str = None,
+                 configs: str = None, profile: str = None, profile_stacks: str = None) -> None:
         """Listener initialization.
 
         *Args:*\n
             _server_ - name of TestRail server;\n
             _user_ - name of TestRail user;\n
             _password_ - password of TestRail user;\n
-            _run_id_ - ID of the test run;\n
+            _run_id_ - ID of the test run, if empty it's taken from environment variable TESTRAIL_RUN_ID;\n
             _protocol_ - connecting protocol to TestRail server: http or https;\n
             _juggler_disable_ - indicator to disable juggler logic; if exist, then juggler logic will be disabled;\n
-            _update_ - indicator to update test case in TestRail; if exist, then test will be updated.
+            _update_ - indicator to update test case in TestRail; if exist, then test will be updated;\n
+            _aggregate_ - indicator to aggregate results of the tests with the same case ID;
+            if exist, then one result per case will be posted at the end of the run;\n
+            _plan_id_ - ID of the test plan; if exist, then results are posted to its test runs instead of _run_id_;\n
+            _configs_ - configurations selector of the test runs of the test plan, e.g. "Chrome,Windows|Firefox";\n
+            _profile_ - path to the report file of the listener profiling; if exist, then listener is profiled;\n
+            _profile_stacks_ - number of the slowest sampled tests to add call stacks statistics to the profiling report for.
         """
+        run_id = run_id or os.environ.get(TESTRAIL_RUN_ID_ENV_VAR, '')
         testrail_url = '{protocol}://{server}/testrail/'.format(protocol=protocol, server=server)
         self._url = testrail_url + 'index.php?/api/v2/'
         self._user = user
@@ -68,11 +316,175 @@ class TestRailListener(object):
         self.run_id = run_id
         self.juggler_disable = juggler_disable
         self.update = update
-        self.tr_client = TestRailAPIClient(server, user, password, run_id, protocol)
+        self.aggregate = aggregate
+        self.plan_id = plan_id
+        self.configs = configs
+        self._aggregated_results: Dict[str, List[JsonDict]] = {}
+        self._plan_results: List[Tuple[List[str], JsonDict, Optional[str]]] = []
+        self.tr_client = get_shared_client(server, user, password, run_id, protocol)
         self._vars_for_report_link: Optional[Dict[str, str]] = None
+        self._warm_up_futures: Dict[str, Future] = {}
+        self._tests_status_ids: Optional[Dict[str, Dict[str, int]]] = None
+        self._posted_status_ids: Dict[str, Dict[str, int]] = {}
+        self._plan_routing_failed = False
+        self._case_description_missing = False
+        self.profile = profile
+        self._profiler = ListenerProfiler(bool(profile), int(profile_stacks or 0))
         logger.info('[TestRailListener] url: {testrail_url}'.format(testrail_url=testrail_url))
         logger.info('[TestRailListener] user: {user}'.format(user=user))
-        logger.info('[TestRailListener] the ID of the test run: {run_id}'.format(run_id=run_id))
+        if plan_id:
+            logger.info('[TestRailListener] the ID of the test plan: {plan_id}'.format(plan_id=plan_id))
+        else:
+            logger.info('[TestRailListener] the ID of the test run: {run_id}'.format(run_id=run_id))
+
+    def start_suite(self, name: str, attributes: JsonDict) -> None:
+        """ Start background warm-up of TestRail metadata when the root suite starts.
+
+        *Args:* \n
+            _name_ - name of test suite in Robot Framework;\n
+            _attributes_ - attributes of test suite in Robot Framework.
+        """
+        if attributes['id'] == 's1' and not self._warm_up_futures:
+            self._warm_up()
+
+    def _warm_up(self) -> None:
+        """ Request tests of the test runs and case fields concurrently in background."""
+        _ = self.vars_for_report_link
+        executor = ThreadPoolExecutor(max_workers=len(self._warm_up_requests))
+        self._warm_up_futures = {name: executor.submit(request) for name, request in self._warm_up_requests.items()}
+        executor.shutdown(wait=False)
+
+    @property
+    def _warm_up_requests(self) -> Dict[str, Callable[[], Any]]:
+        """ Requests of the warm-up by their names."""
+        return {
+            'tests': self._get_runs_tests,
+            'case_fields': self.tr_client.get_case_fields,
+        }
+
+    def _retry_warm_up(self, name: str) -> Future:
+        """ Repeat the failed warm-up request in the current thread.
+
+        *Args:* \n
+            _name_ - name of the warm-up request.
+
+        *Returns:*\n
+            Finished future of the request.
+        """
+        future: Future = Future()
+        try:
+            future.set_result(self._warm_up_requests[name]())
+        except requests.RequestException as error:
+            future.set_exception(error)
+        self._warm_up_futures[name] = future
+        return future
+
+    def _get_runs_tests(self) -> Dict[str, List[TestRecord]]:
+        """ Get tests of the test run, or of the selected test runs of the test plan.
+
+        The test plan is requested once, then its test runs are requested concurrently.
+
+        *Returns:*\n
+            Dictionary of test records by test run ID.
+        """
+        if not self.plan_id:
+            return {str(self.run_id): self.tr_client.get_test_records(self.run_id)}
+        run_ids = self.tr_client.get_plan_run_ids(self.plan_id, self.configs)
+        with ThreadPoolExecutor() as executor:
+            return dict(zip(map(str, run_ids), executor.map(self.tr_client.get_test_records, run_ids)))
+
+    def _get_warmed_up(self, name: str, wait: bool = False) -> Any:
+        """ Get result of the warm-up request.
+
+        *Args:* \n
+            _name_ - name of the warm-up request;\n
+            _wait_ - wait for the request, repeat it if it failed and raise its error instead of returning None.
+
+        *Returns:*\n
+            Result of the request, None if it isn't finished yet or failed.
+        """
+        if wait and not self._warm_up_futures:
+            self._warm_up()
+        future = self._warm_up_futures.get(name)
+        if wait and future is not None:
+            if future.exception() is not None:
+                future = self._retry_warm_up(name)
+            return future.result()
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def _get_tests_status_ids(self, wait: bool = False) -> Optional[Dict[str, Dict[str, int]]]:
+        """ Get the latest statuses of the tests of the test runs from the warm-up.
+
+        *Args:* \n
+            _wait_ - wait for the warm-up.
+
+        *Returns:*\n
+            Dictionary of test status IDs by case ID by test run ID, None if the warm-up isn't finished yet.
+        """
+        if self._tests_status_ids is None:
+            runs_tests = self._get_warmed_up('tests', wait)
+            if runs_tests is not None:
+                tests_status_ids = {
+                    run_id: {str(test.case_id): test.status_id for test in tests if test.case_id is not None}
+                    for run_id, tests in runs_tests.items()}
+                for run_id, status_ids in self._posted_status_ids.items():
+                    tests_status_ids.setdefault(run_id, {}).update(status_ids)
+                self._tests_status_ids = tests_status_ids
+        return self._tests_status_ids
+
+    def _get_case_run_ids(self, case_id: str) -> List[str]:
+        """ Get IDs of the test runs to post the test case results to.
+
+        In test plan mode waits for the warm-up to route the case to all test runs of the plan that contain it.
+
+        *Args:* \n
+            _case_id_ - test case ID.
+
+        *Returns:*\n
+            List of test run IDs.
+        """
+        if not self.plan_id:
+            return [str(self.run_id)]
+        tests_status_ids = cast(Dict[str, Dict[str, int]], self._get_tests_status_ids(wait=True))
+        return [run_id for run_id, status_ids in tests_status_ids.items() if case_id in status_ids]
+
+    @profile_phase('status_lookup')
+    def _get_old_test_status_id(self, case_id: str, run_id: str) -> Optional[int]:
+        """ Get the latest test status id by case id.
+
+        The status is taken from the warmed up tests of the test run,
+        if they aren't received yet, it's requested from TestRail.
+
+        *Args:* \n
+            _case_id_ - test case ID;\n
+            _run_id_ - test run ID.
+
+        *Returns:*\n
+            Test status ID, None if the test has no results.
+        """
+        run_status_ids = (self._get_tests_status_ids() or {}).get(run_id, {})
+        if case_id in run_status_ids:
+            status_id = run_status_ids[case_id]
+            return None if status_id == TESTRAIL_STATUS_ID_UNTESTED else status_id
+        return self.tr_client.get_test_status_id_by_case_id(run_id, case_id)
+
+    def _set_new_test_status_id(self, case_id: str, run_id: str, status_id: int) -> None:
+        """ Save posted test status to use it as the latest one for the next tests.
+
+        The statuses posted before the warm-up is finished are applied on top of the warmed up tests,
+        since they can be received before the posting.
+
+        *Args:* \n
+            _case_id_ - test case ID;\n
+            _run_id_ - test run ID;\n
+            _status_id_ - posted test status ID.
+        """
+        if self._tests_status_ids is not None:
+            self._tests_status_ids.setdefault(run_id, {})[case_id] = status_id
+        else:
+            self._posted_status_ids.setdefault(run_id, {})[case_id] = status_id
 
     def end_test(self, name: str, attributes: JsonDict) -> None:
         """ Update test case in TestRail.
@@ -81,31 +493,276 @@ class TestRailListener(object):
             _name_ - name of test case in Robot Framework;\n
             _attributes_ - attributes of test case in Robot Framework.
         """
-        tags_value = self._get_tags_value(attributes['tags'])
-        case_id = tags_value['testrailid']
+        with self._profiler.test(attributes['longname']):
+            self._end_test(name, attributes)
+
+    def _end_test(self, name: str, attributes: JsonDict) -> None:
+        """ Update test case in TestRail and post test results.
 
-        if not case_id:
+        *Args:* \n
+            _name_ - name of test case in Robot Framework;\n
+            _attributes_ - attributes of test case in Robot Framework.
+        """
+        with self._profiler.phase('tags'):
+            tags_value = self._get_tags_value(attributes['tags'])
+            case_ids = get_case_ids_from_tags(attributes['tags'])
+
+        if not case_ids:
             logger.warn(f"[TestRailListener] No case_id presented for test_case {name}.")
             return
 
         if 'skipped' in [tag.lower() for tag in attributes['tags']]:
-            logger.warn(f"[TestRailListener] SKIPPED test case \"{name}\" with testrailId={case_id} "
+            logger.warn(f"[TestRailListener] SKIPPED test case \"{name}\" with testrailId={','.join(case_ids)} "
                         "will not be posted to Testrail")
             return
 
         # Update test case
-        if self.update:
+        if self.update and case_ids[0] not in self._aggregated_results:
             references = tags_value['references']
-            self._update_case_description(attributes, case_id, name, references)
+            self._update_case_description(attributes, case_ids[0], name, references)
         # Send test results
         defects = tags_value['defects']
-        old_test_status_id = self.tr_client.get_test_status_id_by_case_id(self.run_id, case_id)
-        test_result = self._prepare_test_result(attributes, defects, old_test_status_id, case_id)
+        if self.aggregate:
+            for case_id in case_ids:
+                self._aggregated_results.setdefault(case_id, []).append({
+                    'longname': attributes['longname'], 'status': attributes['status'],
+                    'elapsedtime': attributes['elapsedtime'], 'message': attributes['message'], 'defects': defects})
+            return
+        if self.plan_id:
+            self._plan_results.append((case_ids, attributes, defects))
+            if len(self._plan_results) % self.PLAN_RESULTS_BATCH_SIZE == 0:
+                self._post_plan_results()
+            return
+        if len(case_ids) > 1:
+            case_ids = self._get_run_case_ids(case_ids)
+        test_results = []
+        for case_id in list(case_ids):
+            try:
+                old_test_status_id = self._get_old_test_status_id(case_id, self.run_id)
+            except requests.HTTPError as error:
+                logger.warn(f"[TestRailListener] http error on getting status of case_id = {case_id}, "
+                            f"its result will not be posted to Testrail\n{error}")
+                case_ids.remove(case_id)
+                continue
+            test_result = self._prepare_test_result(attributes, defects, old_test_status_id, case_id)
+            test_results.append(test_result)
+        with self._profiler.phase('post'):
+            if len(case_ids) > 1:
+                self._post_test_results(case_ids, test_results)
+                return
+            for case_id, test_result in zip(case_ids, test_results):
+                self._post_test_result(case_id, test_result)
+
+    def _get_run_case_ids(self, case_ids: List[str]) -> List[str]:
+        """ Get the test cases that are in the test run and warn about the missing ones.
+
+        The test cases are checked by the warmed up tests of the test run,
+        if they aren't received yet, all the test cases are returned.
+
+        *Args:* \n
+            _case_ids_ - test case IDs.
+
+        *Returns:*\n
+            List of test case IDs.
+        """
+        run_status_ids = (self._get_tests_status_ids() or {}).get(str(self.run_id))
+        if run_status_ids is None:
+            return case_ids
+        missing_case_ids = [case_id for case_id in case_ids if case_id not in run_status_ids]
+        if missing_case_ids:
+            logger.warn(f"[TestRailListener] case_id = {','.join(missing_case_ids)} is not in test run {self.run_id}, "
+                        "its result will not be posted to Testrail")
+        return [case_id for case_id in case_ids if case_id in run_status_ids]
+
+    def _post_test_result(self, case_id: str, test_result: Dict[str, Union[str, int]]) -> None:
+        """ Post the test result of the test case to the test run.
+
+        *Args:* \n
+            _case_id_ - test case ID;\n
+            _test_result_ - test result.
+        """
         try:
             self.tr_client.add_result_for_case(self.run_id, case_id, test_result)
+            self._set_new_test_status_id(case_id, self.run_id, cast(int, test_result['status_id']))
         except requests.HTTPError as error:
             logger.error(f"[TestRailListener] http error on case_id = {case_id}\n{error}")
 
+    def _post_test_results(self, case_ids: List[str], test_results: List[Dict[str, Union[str, int]]]) -> None:
+        """ Post the test results of several test cases to the test run with one request.
+
+        TestRail rejects the whole request if any test case isn't in the test run,
+        in this case the test results are posted one by one.
+
+        *Args:* \n
+            _case_ids_ - test case IDs;\n
+            _test_results_ - test results in the order of the test cases.
+        """
+        for case_id, test_result in zip(case_ids, test_results):
+            test_result['case_id'] = case_id
+        try:
+            self.tr_client.add_results_for_cases(self.run_id, test_results)
+        except requests.HTTPError as error:
+            logger.warn(f"[TestRailListener] http error on case_id = {','.join(case_ids)}, "
+                        f"results are posted one by one\n{error}")
+            for case_id, test_result in zip(case_ids, test_results):
+                self._post_test_result(case_id, test_result)
+            return
+        for case_id, test_result in zip(case_ids, test_results):
+            self._set_new_test_status_id(case_id, self.run_id, cast(int, test_result['status_id']))
+
+    def end_suite(self, name: str, attributes: JsonDict) -> None:
+        """ Post batched test results of the test plan and aggregated test results at the end of the run.
+
+        *Args:* \n
+            _name_ - name of test suite in Robot Framework;\n
+            _attributes_ - attributes of test suite in Robot Framework.
+        """
+        if self.plan_id:
+            self._post_plan_results(final=attributes['id'] == 's1')
+        if self.aggregate and attributes['id'] == 's1':
+            self._post_aggregated_results()
+
+    def close(self) -> None:
+        """ Write report of the listener profiling, if it's enabled."""
+        if self.profile:
+            self._profiler.write(self.profile)
+
+    def _post_plan_results(self, final: bool = False) -> None:
+        """ Post batched test results to all test runs of the test plan containing their cases, one request per run.
+
+        If the tests of the test runs of the test plan can't be received, the results are kept until the next batch.
+
+        *Args:* \n
+            _final_ - indicator of the end of the run; if exist, then the results that can't be routed are dropped.
+        """
+        if not self._plan_results:
+            return
+        try:
+            self._get_tests_status_ids(wait=True)
+        except requests.RequestException as error:
+            if final:
+                logger.error(f"[TestRailListener] {len(self._plan_results)} results are not posted, tests of test plan "
+                             f"{self.plan_id} can't be received\n{error}")
+                self._plan_results = []
+            elif not self._plan_routing_failed:
+                logger.error(f"[TestRailListener] tests of test plan {self.plan_id} can't be received, "
+                             f"results are kept until the next batch\n{error}")
+            self._plan_routing_failed = True
+            return
+        plan_results, self._plan_results = self._plan_results, []
+        results_by_run: Dict[str, List[Dict[str, Union[str, int]]]] = {}
+        for case_ids, attributes, defects in plan_results:
+            for case_id in case_ids:
+                try:
+                    for run_id in self._get_routed_run_ids(case_id):
+                        old_test_status_id = self._get_old_test_status_id(case_id, run_id)
+                        if not self._is_test_status_postable(attributes['status'], old_test_status_id, case_id):
+                            continue
+                        test_result = self._prepare_test_result(attributes, defects, old_test_status_id, case_id)
+                        self._add_run_result(results_by_run, run_id, case_id, test_result)
+                except requests.RequestException as error:
+                    logger.error(f"[TestRailListener] http error on routing results of case_id = {case_id} "
+                                 f"to test plan runs\n{error}")
+        self._post_results_by_run(results_by_run)
+
+    def _post_aggregated_results(self) -> None:
+        """ Post one result per case for all aggregated test results with one request per test run."""
+        if not self._aggregated_results:
+            return
+        aggregated_results, self._aggregated_results = self._aggregated_results, {}
+        results_by_run: Dict[str, List[Dict[str, Union[str, int]]]] = {}
+        for case_id, iterations in aggregated_results.items():
+            status = self._get_aggregated_status(iterations)
+            try:
+                for run_id in self._get_routed_run_ids(case_id):
+                    old_test_status_id = self._get_old_test_status_id(case_id, run_id)
+                    if not self._is_test_status_postable(status, old_test_status_id, case_id):
+                        continue
+                    test_result = self._prepare_aggregated_test_result(iterations, old_test_status_id, case_id)
+                    self._add_run_result(results_by_run, run_id, case_id, test_result)
+            except requests.RequestException as error:
+                logger.error(f"[TestRailListener] http error on routing aggregated results of case_id = {case_id}\n"
+                             f"{error}")
+        self._post_results_by_run(results_by_run)
+
+    @classmethod
+    def _get_aggregated_status(cls, iterations: List[JsonDict]) -> str:
+        """ Get the worst status of the tests with the same case ID.
+
+        *Args:* \n
+            _iterations_ - list of attributes of the tests with the case ID.
+
+        *Returns:*\n
+            Robot Framework test status.
+        """
+        return max((iteration['status'] for iteration in iterations),
+                   key=lambda value: cls.ROBOT_STATUSES_SEVERITY.get(value, 2))
+
+    def _is_test_status_postable(self, new_test_status: str, old_test_status_id: Optional[int], case_id: str) -> bool:
+        """ Check that the test result can be posted and warn if it can't.
+
+        Juggler keeps the old status of the test case for the statuses other than "PASS" and "FAIL"
+        (e.g. "SKIP" and "NOT RUN"), so there is nothing to post for the test case without results.
+
+        *Args:* \n
+            _new_test_status_ - new test status;\n
+            _old_test_status_id_ - old test status id;\n
+            _case_id_ - test case ID.
+
+        *Returns:*\n
+            True if the test result can be posted.
+        """
+        if self.juggler_disable or new_test_status in ('PASS', 'FAIL') or old_test_status_id is not None:
+            return True
+        logger.warn(f"[TestRailListener] {new_test_status} result of case_id = {case_id} without previous results "
+                    "will not be posted to Testrail")
+        return False
+
+    def _get_routed_run_ids(self, case_id: str) -> List[str]:
+        """ Get IDs of the test runs for the case and warn if there are none.
+
+        *Args:* \n
+            _case_id_ - test case ID.
+
+        *Returns:*\n
+            List of test run IDs.
+        """
+        run_ids = self._get_case_run_ids(case_id)
+        if not run_ids:
+            logger.warn(f"[TestRailListener] case_id = {case_id} is not in any test run of test plan {self.plan_id}")
+        return run_ids
+
+    def _add_run_result(self, results_by_run: Dict[str, List[Dict[str, Union[str, int]]]], run_id: str,
+                        case_id: str, test_result: Dict[str, Union[str, int]]) -> None:
+        """ Add the test result to the batch of the test run.
+
+        Its status is saved as the latest one at once, so the next results of the same case in the batch
+        are juggled against it.
+
+        *Args:* \n
+            _results_by_run_ - batches of test results by test run ID;\n
+            _run_id_ - test run ID;\n
+            _case_id_ - test case ID;\n
+            _test_result_ - test result.
+        """
+        test_result['case_id'] = case_id
+        results_by_run.setdefault(run_id, []).append(test_result)
+        self._set_new_test_status_id(case_id, run_id, cast(int, test_result['status_id']))
+
+    @profile_phase('post')
+    def _post_results_by_run(self, results_by_run: Dict[str, List[Dict[str, Union[str, int]]]]) -> None:
+        """ Post batches of test results, one request per test run.
+
+        *Args:* \n
+            _results_by_run_ - batches of test results by test run ID.
+        """
+        for run_id, test_results in results_by_run.items():
+            try:
+                self.tr_client.add_results_for_cases(run_id, test_results)
+            except requests.HTTPError as error:
+                logger.error(f"[TestRailListener] http error on posting results to run_id = {run_id}\n{error}")
+
+    @profile_phase('update_case')
     def _update_case_description(self, attributes: JsonDict, case_id: str, name: str,
                                  references: Optional[str]) -> None:
         """ Update test case description in TestRail
@@ -121,6 +778,12 @@ class TestRailListener(object):
         request_fields: Dict[str, Union[str, int, None]] = {
             'title': name, 'type_id': self.TESTRAIL_CASE_TYPE_ID_AUTOMATED,
             'custom_case_description': description, 'refs': references}
+        case_fields = self._get_warmed_up('case_fields')
+        if case_fields is not None and all(field['system_name'] != 'custom_case_description' for field in case_fields):
+            if not self._case_description_missing:
+                logger.warn("[TestRailListener] there is no custom field \"case_description\" in TestRail")
+                self._case_description_missing = True
+            del request_fields['custom_case_description']
         try:
             json_result = self.tr_client.update_case(case_id, request_fields)
             result = json.dumps(json_result, sort_keys=True, indent=4)
@@ -128,6 +791,7 @@ class TestRailListener(object):
         except requests.HTTPError as error:
             logger.error(f"[TestRailListener] http error, while execute request:\n{error}")
 
+    @profile_phase('prepare_result')
     def _prepare_test_result(self, attributes: JsonDict, defects: Optional[str], old_test_status_id: Optional[int],
                              case_id: str) -> Dict[str, Union[str, int]]:
         """Create json with test result information.
@@ -147,15 +811,8 @@ class TestRailListener(object):
                   f" {test_time:.3f} s"
         if link_to_report:
             comment += f'\nLink to Report: {link_to_report}'
-        if self.juggler_disable:
-            if attributes['status'] == 'PASS':
-                new_test_status_id = self.TESTRAIL_TEST_STATUS_ID_PASSED
-            else:
-                new_test_status_id = self.TESTRAIL_TEST_STATUS_ID_FAILED
-        else:
-            new_test_status_id = self._prepare_new_test_status_id(attributes['status'], old_test_status_id)
         test_result: Dict[str, Union[str, int]] = {
-            'status_id': new_test_status_id,
+            'status_id': self._get_new_test_status_id(attributes['status'], old_test_status_id),
             'comment': comment,
         }
         elapsed_time = TestRailListener._time_span_format(test_time)
@@ -165,6 +822,63 @@ class TestRailListener(object):
             test_result['defects'] = defects
         return test_result
 
+    @profile_phase('prepare_result')
+    def _prepare_aggregated_test_result(self, iterations: List[JsonDict], old_test_status_id: Optional[int],
+                                        case_id: str) -> Dict[str, Union[str, int]]:
+        """Create json with one test result for all the tests with the same case ID.
+
+        The worst status of the tests wins, elapsed times are summed up
+        and results of the tests are listed in the comment table.
+
+        *Args:* \n
+            _iterations_ - list of attributes of the tests with the case ID;\n
+            _old_test_status_id_ - old test status id;\n
+            _case_id_ - test case ID.
+
+        *Returns:*\n
+            Dictionary with test results.
+        """
+        link_to_report = self._get_url_report_by_case_id(case_id)
+        status = self._get_aggregated_status(iterations)
+        test_time = sum(float(iteration['elapsedtime']) for iteration in iterations) / 1000
+        failed_count = sum(1 for iteration in iterations if iteration['status'] != 'PASS')
+        comment = f"Autotests: {len(iterations)}, not passed: {failed_count}\nTest time: {test_time:.3f} s\n" \
+                  "|||:#|:Status|:Time|:Autotest name|:Message"
+        for number, iteration in enumerate(iterations, 1):
+            message = ' '.join(iteration['message'].split()).replace('|', '/')[:self.AGGREGATED_MESSAGE_LENGTH]
+            comment += f"\n|| {number} | {iteration['status']} | {float(iteration['elapsedtime']) / 1000:.3f} s" \
+                       f" | {iteration['longname']} | {message}"
+        if link_to_report:
+            comment += f'\nLink to Report: {link_to_report}'
+        test_result: Dict[str, Union[str, int]] = {
+            'status_id': self._get_new_test_status_id(status, old_test_status_id),
+            'comment': comment,
+        }
+        elapsed_time = TestRailListener._time_span_format(test_time)
+        if elapsed_time:
+            test_result[TestRailListener.ELAPSED_KEY] = elapsed_time
+        defects = [defect.strip() for iteration in iterations if iteration['defects']
+                   for defect in iteration['defects'].split(',')]
+        if defects:
+            test_result['defects'] = ', '.join(dict.fromkeys(defects))
+        return test_result
+
+    def _get_new_test_status_id(self, new_test_status: str, old_test_status_id: Optional[int]) -> int:
+        """Get new test status id with juggler logic, unless it's disabled.
+
+        *Args:* \n
+            _new_test_status_ - new test status;\n
+            _old_test_status_id_ - old test status id.
+
+        *Returns:*\n
+            New test status id.
+        """
+        if self.juggler_disable:
+            if new_test_status == 'PASS':
+                return self.TESTRAIL_TEST_STATUS_ID_PASSED
+            return self.TESTRAIL_TEST_STATUS_ID_FAILED
+        return self._prepare_new_test_status_id(new_test_status, old_test_status_id)
+
     def _prepare_new_test_status_id(self, new_test_status: str, old_test_status_id: Optional[int]) -> int:
         """Prepare new test status id by new test status and old test status id.
         Alias of this method is "juggler".
@@ -296,10 +1010,11 @@ class TestRailListener(object):
         *Returns:*\n
             Cached variables for report link.
         """
-        if not self._vars_for_report_link:
+        if self._vars_for_report_link is None:
             self._vars_for_report_link = self._get_vars_for_report_link()
         return self._vars_for_report_link
 
+    @profile_phase('report_link')
     def _get_url_report_by_case_id(self, case_id: Union[str, int]) -> Optional[str]:
         """" Getting url for Report by id test case.
 
@@ -311,7 +1026,9 @@ class TestRailListener(object):
         """
         build_url = ''
         report_filename = self.vars_for_report_link.get('TORS_REPORT', 'report.html')
-        report_uri = f'{report_filename}#search?include=testrailid={case_id}'
+        tag_patterns = (f'testrailid={case_id}', f'testrailid={case_id},*', f'testrailid=*,{case_id}',
+                        f'testrailid=*,{case_id},*')
+        report_uri = f'{report_filename}#search?include={"OR".join(tag_patterns)}'
         if 'TEAMCITY_HOST_URL' in self.vars_for_report_link:
             vars = self.vars_for_report_link
             base_hostname = vars.get('TEAMCITY_HOST_URL')
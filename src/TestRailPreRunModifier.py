@@ -1,14 +1,23 @@
 # -*- coding: utf-8 -*-
 
-from typing import List, Optional
+import os
+from typing import cast, Dict, Iterator, List, Optional, Set, Tuple
 
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError, Future
 from requests.exceptions import RequestException
 from robot.api import SuiteVisitor, TestSuite
+from robot.model import TestCase
 from robot.output import LOGGER
-from TestRailAPIClient import TestRailAPIClient, TESTRAIL_STATUS_ID_PASSED
+from TestRailAPIClient import TESTRAIL_RUN_ID_ENV_VAR, TESTRAIL_STATUS_ID_PASSED, get_case_ids_from_tags, \
+    get_shared_client, share_client
 
 CONNECTION_TIMEOUT = 60  # Value in seconds of timeout connection with testrail for one request
+DEFAULT_HISTORY_DEPTH = 10  # Number of the latest results per test case used for ordering
+ORDER_FAILFAST = 'failfast'
+ORDERS = (ORDER_FAILFAST,)
+
+# custom types
+History = Dict[str, List[Tuple[int, int]]]  # noqa: E993
 
 
 class TestRailPreRunModifier(SuiteVisitor):
@@ -21,6 +30,9 @@ class TestRailPreRunModifier(SuiteVisitor):
     == Preconditions ==
     1. [ http://docs.gurock.com/testrail-api2/introduction | Enable TestRail API] \n
 
+    The TestRail client is shared with TestRailListener of the same server, user and test run,
+    so the tests of the test run and the statuses requested by the modifier aren't requested by the listener again.
+
     == Example ==
     1. Create test cases in TestRail with case_id: 10,11,12. \n
     2. Add test cases with case_id:10,12 into test run with run_id = 20. \n
@@ -41,14 +53,43 @@ class TestRailPreRunModifier(SuiteVisitor):
     4. Run Robot Framework with pre-run modifier:
     | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0 robot_suite.robot
     5. Test cases "Autotest name 1" and "Autotest name 3" will be executed. Test case "Autotest name 2" will be skipped.
+    A test covering several test cases can have several IDs in "testrailid" tag, e.g. "testrailid=10,11",
+    it will be executed if any of the test cases is in the test run.
     6. To execute tests from TestRail test run only with a certain status, for example "failed" and "blocked":
     | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0:failed:blocked robot_suite.robot
     6. To execute stable tests from TestRail test run with run analysis depth = 5:
     | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:5 robot_suite.robot
+    7. To execute tests that are most likely to fail first:
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0:order=failfast robot_suite.robot
+    Tests and suites are sorted by failure probability per second of runtime,
+    calculated from the latest results of the test run, 10 per test case by default.
+    The number of the latest results is set by "history_depth" option, e.g. "history_depth=20",
+    it doesn't depend on the analysis depth of run results, which selects only stable tests.
+    8. To split tests of TestRail test run between 4 parallel workers, run on each worker its shard (from 0 to 3):
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0:shard_index=0:shard_count=4 robot_suite.robot
+    Tests are assigned to the shards by the longest-processing-time-first algorithm.
+    To balance the shards by mean elapsed time of the test run results, pass the same UNIX timestamp to all workers,
+    e.g. the start time of the CI pipeline, with "history_before" option:
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0:shard_index=0:shard_count=4:history_before=1700000000 robot_suite.robot
+    Only the results created before it are used, so the results posted by the workers that have already started
+    don't change the split. Without "history_before" option the shards are balanced by the number of tests.
+    The split doesn't depend on the test statuses, so all workers get the same split.
+    If the tests of the test run can't be obtained, no tests are executed
+    instead of running all of them on every worker.
+    9. To add the test cases of the suite that are missing in the test run before execution:
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password:20:http:0:sync_run=True robot_suite.robot
+    10. To create a new test run with the test cases of the suite, pass empty run ID and ID of the project:
+    | robot --prerunmodifier TestRailPreRunModifier:testrail_server_name:tester_user_name:tester_user_password::http:0:sync_run=True:project_id=1:suite_id=2:run_name=Nightly robot_suite.robot
+    | --listener TestRailListener.py:testrail_server_name:tester_user_name:tester_user_password::https
+    ID of the created test run is saved to the environment variable TESTRAIL_RUN_ID, which is read by the listener
+    started with empty run ID.
     """
 
     def __init__(self, server: str, user: str, password: str, run_id: str, protocol: str,  # noqa: E951
-                 results_depth: str, *status_names: str) -> None:
+                 results_depth: str, *status_names: str, order: str = None, history_depth: str = None,
+                 history_before: str = None, shard_index: str = None,
+                 shard_count: str = None, sync_run: str = None, project_id: str = None, suite_id: str = None,
+                 run_name: str = None) -> None:
         """Pre-run modifier initialization.
 
         *Args:*\n
@@ -58,22 +99,58 @@ class TestRailPreRunModifier(SuiteVisitor):
             _run_id_ - ID of the test run;\n
             _protocol_ - connecting protocol to TestRail server: http or https;\n
             _results_depth_ - analysis depth of run results;\n
-            _status_names_ - name of test statuses in TestRail.
+            _status_names_ - name of test statuses in TestRail;\n
+            _order_ - order of test execution: "failfast" to run the tests that are most likely to fail first;\n
+            _history_depth_ - number of the latest results per test case used for ordering and sharding;\n
+            _history_before_ - UNIX timestamp, only the test run results created before it are used
+            for ordering and sharding; if not passed with shards, then the shards are balanced by the number of tests;\n
+            _shard_index_ - index of the shard of the tests to execute, from 0 to shard_count - 1;\n
+            _shard_count_ - number of the shards to split the tests into;\n
+            _sync_run_ - indicator to add test cases of the suite to the test run before execution;
+            if exist, then test run will be updated, or created if run ID is empty;\n
+            _project_id_ - ID of the project to create the test run in;\n
+            _suite_id_ - ID of the test suite to create the test run for
+            (optional if the project is operating in single suite mode);\n
+            _run_name_ - name of the created test run, name of the Robot Framework suite by default.
         """
+        if order is not None and order.lower() not in ORDERS:
+            raise ValueError("Unknown order '{order}', expected one of: {orders}".format(
+                order=order, orders=', '.join(ORDERS)))
+        if (shard_index is None) != (shard_count is None):
+            raise ValueError("Both shard_index and shard_count must be passed to split tests into shards")
+        if shard_count is not None and not 0 <= int(shard_index) < int(shard_count):
+            raise ValueError("Shard index {index} is out of range for {count} shards".format(
+                index=shard_index, count=shard_count))
+        if sync_run and not run_id and project_id is None:
+            raise ValueError("Project ID must be passed to create a test run")
+        if sync_run and not run_id and shard_count is not None:
+            raise ValueError("Test run can't be created by every shard, pass ID of the test run created beforehand")
         self.run_id = run_id
         self.status_names = status_names
-        self.tr_client = TestRailAPIClient(server, user, password, run_id, protocol)
+        self.tr_client = get_shared_client(server, user, password, run_id, protocol)
         self.results_depth = int(results_depth) if str(results_depth).isdigit() else 0
-        self._tr_tags_list: Optional[List[str]] = None
-        self._tr_stable_tags_list: Optional[List[str]] = None
+        self._tr_tags_list: Optional[Set[str]] = None
+        self._tr_stable_tags_list: Optional[Set[str]] = None
+        self.order = order.lower() if order else None
+        self.history_depth = int(history_depth) if history_depth else DEFAULT_HISTORY_DEPTH
+        self.history_before = int(history_before) if history_before else None
+        self._tr_history: Optional[History] = None
+        self._tr_mean_elapsed: Optional[float] = None
+        self.shard_index = int(shard_index) if shard_index is not None else None
+        self.shard_count = int(shard_count) if shard_count is not None else None
+        self._shard_tests: Optional[Set[int]] = None
+        self.sync_run = sync_run
+        self.project_id = project_id
+        self.suite_id = suite_id
+        self.run_name = run_name
         LOGGER.register_syslog()
 
     @property
-    def tr_stable_tags_list(self) -> List[str]:
-        """Gets list of 'testrailid' tags of the stable test cases.
+    def tr_stable_tags_list(self) -> Set[str]:
+        """Gets 'testrailid' tags of the stable test cases.
 
         Returns:
-            List of tags.
+            Set of tags.
         """
         if self._tr_stable_tags_list is None:
             self._tr_stable_tags_list = self._get_tr_stable_tags_list()
@@ -81,17 +158,44 @@ class TestRailPreRunModifier(SuiteVisitor):
         return self._tr_stable_tags_list
 
     @property
-    def tr_tags_list(self) -> List[str]:
+    def tr_tags_list(self) -> Set[str]:
         """Gets 'testrailid' tags.
 
         Returns:
-            List of tags.
+            Set of tags.
         """
         if self._tr_tags_list is None:
             self._tr_tags_list = self._get_tr_tags_list()
 
         return self._tr_tags_list
 
+    @property
+    def tr_history(self) -> History:
+        """Gets results history of the test cases of the test run.
+
+        Returns:
+            Dictionary of the latest (status ID, elapsed seconds) pairs by case ID.
+        """
+        if self._tr_history is None:
+            self._tr_history = self._get_tr_history()
+
+        return self._tr_history
+
+    @property
+    def tr_mean_elapsed(self) -> float:
+        """Gets mean elapsed time of the test run results.
+
+        Used as runtime of the test cases without timed results.
+
+        Returns:
+            Mean elapsed time in seconds.
+        """
+        if self._tr_mean_elapsed is None:
+            elapsed_list = [elapsed for history in self.tr_history.values() for _, elapsed in history if elapsed]
+            self._tr_mean_elapsed = sum(elapsed_list) / len(elapsed_list) if elapsed_list else 1.0
+
+        return self._tr_mean_elapsed
+
     def _log_to_parent_suite(self, suite: TestSuite, message: str) -> None:
         """Log message to the parent suite.
 
@@ -102,8 +206,8 @@ class TestRailPreRunModifier(SuiteVisitor):
         if suite.parent is None:
             LOGGER.error("{suite}: {message}".format(suite=suite, message=message))
 
-    def _get_tr_tags_list(self) -> List[str]:
-        """Get list of 'testrailid' tags.
+    def _get_tr_tags_list(self) -> Set[str]:
+        """Get set of 'testrailid' tags.
 
         If required test statuses from the test run are passed to modifier,
         a request is made to the TestRail to obtain information about all the statuses.
@@ -113,17 +217,19 @@ class TestRailPreRunModifier(SuiteVisitor):
         If statuses aren't passed to modifier,
         the tags of all tests in the test run will be obtained regardless of their status.
 
+        Only compact records of the tests are kept in memory.
+
         Returns:
-            List of tags.
+            Set of tags.
         """
         status_ids = None
         if self.status_names:
             status_ids = [self.tr_client.get_status_id_by_status_label(name) for name in self.status_names]
-        tests_info = self.tr_client.get_tests(run_id=self.run_id, status_ids=status_ids)
-        return ['testrailid={}'.format(test["case_id"]) for test in tests_info if test["case_id"] is not None]
+        tests = self.tr_client.get_test_records(run_id=self.run_id, status_ids=status_ids)
+        return {'testrailid={}'.format(test.case_id) for test in tests if test.case_id is not None}
 
-    def _get_tr_stable_tags_list(self) -> List[str]:
-        """Get list of 'testrailid' tags of the stable test cases.
+    def _get_tr_stable_tags_list(self) -> Set[str]:
+        """Get set of 'testrailid' tags of the stable test cases.
 
         If analysis depth of the run results is passed to modifier and its value greater than zero,
         a request is made to the TestRail to receive information about test cases whose last result is 'passed'.
@@ -131,12 +237,12 @@ class TestRailPreRunModifier(SuiteVisitor):
         on the basis of which the tags of stable test cases will be received.
 
         Returns:
-            List of stable tags.
+            Set of stable tags.
         """
         stable_case_ids_list = list()
         catched_exceptions = list()
-        passed_tests_info = self.tr_client.get_tests(run_id=self.run_id, status_ids=[TESTRAIL_STATUS_ID_PASSED])
-        case_ids = [test["case_id"] for test in passed_tests_info if test["case_id"] is not None]
+        passed_tests = self.tr_client.get_test_records(run_id=self.run_id, status_ids=[TESTRAIL_STATUS_ID_PASSED])
+        case_ids = [test.case_id for test in passed_tests if test.case_id is not None]
 
         def future_handler(future: Future) -> None:
             """Get result from future with try/except block and to list.
@@ -150,20 +256,234 @@ class TestRailPreRunModifier(SuiteVisitor):
                 catched_exceptions.append(exception)
             else:
                 passed_list = [result for result in case_results if
-                               result['status_id'] == TESTRAIL_STATUS_ID_PASSED]
+                               result.status_id == TESTRAIL_STATUS_ID_PASSED]
                 if len(passed_list) == int(self.results_depth):
                     stable_case_ids_list.append(case_id)
 
         with ThreadPoolExecutor() as executor:
-            futures = {executor.submit(self.tr_client.get_results_for_case, self.run_id, case_id, self.results_depth):
-                       case_id for case_id in case_ids}
+            futures = {executor.submit(self.tr_client.get_result_records, self.run_id, case_id,
+                                       limit=self.results_depth): case_id for case_id in case_ids}
 
             for future in as_completed(futures, timeout=CONNECTION_TIMEOUT):
                 future_handler(future)
 
         if catched_exceptions:
             raise catched_exceptions[0]
-        return ['testrailid={}'.format(case_id) for case_id in stable_case_ids_list]
+        return {'testrailid={}'.format(case_id) for case_id in stable_case_ids_list}
+
+    def _get_tr_history(self) -> History:
+        """Get results history of the test cases of the test run.
+
+        Tests and results of the test run are requested once in bulk,
+        results are bound to test cases by test ID. For each test case only the latest results
+        are kept, their number is the history depth. If the history timestamp is passed,
+        only the results created before it are requested.
+
+        Returns:
+            Dictionary of the latest (status ID, elapsed seconds) pairs by case ID.
+        """
+        depth = self.history_depth
+        tests = self.tr_client.get_test_records(run_id=self.run_id)
+        case_ids = {test.id: str(test.case_id) for test in tests if test.case_id is not None}
+        history: History = {case_id: [] for case_id in case_ids.values()}
+        for result in self.tr_client.get_result_records(run_id=self.run_id, created_before=self.history_before):
+            case_id = case_ids.get(result.test_id)
+            if case_id is None or result.status_id is None or len(history[case_id]) >= depth:
+                continue
+            history[case_id].append((result.status_id, result.elapsed))
+        return history
+
+    @staticmethod
+    def _get_case_ids(test: TestCase) -> List[str]:
+        """Get TestRail case IDs from 'testrailid' tags of the test.
+
+        *Args:*\n
+            _test_ - Robot Framework test case object.
+
+        *Returns:*\n
+            List of case IDs, empty if test has no 'testrailid' tag.
+        """
+        return get_case_ids_from_tags(test.tags)
+
+    def _get_test_history(self, test: TestCase) -> List[Tuple[int, int]]:
+        """Get results history of all the test cases covered by the test.
+
+        *Args:*\n
+            _test_ - Robot Framework test case object.
+
+        *Returns:*\n
+            List of (status ID, elapsed seconds) pairs.
+        """
+        return [result for case_id in self._get_case_ids(test) for result in self.tr_history.get(case_id, [])]
+
+    def _get_runtime(self, test: TestCase) -> float:
+        """Get expected runtime of the test.
+
+        Runtime is mean elapsed time of the test case results,
+        for the test cases without timed results it's mean elapsed time of all the test run results.
+
+        *Args:*\n
+            _test_ - Robot Framework test case object.
+
+        *Returns:*\n
+            Runtime in seconds.
+        """
+        history = self._get_test_history(test)
+        elapsed_list = [elapsed for _, elapsed in history if elapsed]
+        return sum(elapsed_list) / len(elapsed_list) if elapsed_list else self.tr_mean_elapsed
+
+    def _get_failfast_score(self, test: TestCase) -> float:
+        """Get failure probability per second of runtime of the test.
+
+        Failure probability is estimated with Laplace smoothing, so the test cases without
+        results are placed between stable and unstable ones.
+
+        *Args:*\n
+            _test_ - Robot Framework test case object.
+
+        *Returns:*\n
+            Score of the test, the greater the earlier test is executed.
+        """
+        history = self._get_test_history(test)
+        failures = sum(1 for status_id, _ in history if status_id != TESTRAIL_STATUS_ID_PASSED)
+        probability = (failures + 1) / (len(history) + 2)
+        return probability / max(self._get_runtime(test), 1.0)
+
+    def _get_suite_failfast_score(self, suite: TestSuite) -> float:
+        """Get score of the suite as the greatest score of its tests.
+
+        *Args:*\n
+            _suite_ - Robot Framework test suite object.
+
+        *Returns:*\n
+            Score of the suite.
+        """
+        scores = [self._get_failfast_score(test) for test in suite.tests]
+        scores.extend(self._get_suite_failfast_score(child) for child in suite.suites)
+        return max(scores, default=0.0)
+
+    def _order_suite(self, suite: TestSuite) -> None:
+        """Sort tests and child suites of the suite in the fail-fast order.
+
+        *Args:*\n
+            _suite_ - Robot Framework test suite object.
+        """
+        try:
+            suite.tests = sorted(suite.tests, key=self._get_failfast_score, reverse=True)
+            suite.suites = sorted(suite.suites, key=self._get_suite_failfast_score, reverse=True)
+        except RequestException as error:
+            self._log_to_parent_suite(suite, str(error))
+
+    def _sync_run(self, suite: TestSuite) -> None:
+        """Add test cases of the suite to the TestRail test run with one request.
+
+        If run ID is empty, a new test run with the test cases of the suite is created
+        and its ID is saved to the environment variable for the listener.
+        Otherwise test cases missing in the test run are added to it, the existing ones are kept.
+
+        *Args:*\n
+            _suite_ - root Robot Framework test suite object.
+        """
+        case_ids = {int(case_id) for test in self._iter_tests(suite) for case_id in self._get_case_ids(test)
+                    if case_id.isdigit()}
+        if not self.run_id:
+            run_info = self.tr_client.add_run(self.project_id, self.run_name or suite.name, sorted(case_ids),
+                                              suite_id=self.suite_id)
+            self.run_id = self.tr_client.run_id = str(run_info['id'])
+            share_client(self.tr_client)
+            os.environ[TESTRAIL_RUN_ID_ENV_VAR] = self.run_id
+            LOGGER.info("Test run {run_id} is created in TestRail".format(run_id=self.run_id))
+            return
+        run_case_ids = {test.case_id for test in self.tr_client.get_test_records(run_id=self.run_id)
+                        if test.case_id is not None}
+        if case_ids - run_case_ids:
+            self.tr_client.update_run(self.run_id, sorted(run_case_ids | case_ids))
+
+    @staticmethod
+    def _iter_tests(suite: TestSuite) -> Iterator[TestCase]:
+        """Iterate over tests of the suite and all its child suites.
+
+        *Args:*\n
+            _suite_ - Robot Framework test suite object.
+
+        *Returns:*\n
+            Iterator of Robot Framework test case objects.
+        """
+        yield from suite.tests
+        for child in suite.suites:
+            yield from TestRailPreRunModifier._iter_tests(child)
+
+    def _is_test_in_run(self, test: TestCase) -> bool:
+        """Check that the test is included in the TestRail test run.
+
+        *Args:*\n
+            _test_ - Robot Framework test case object.
+
+        *Returns:*\n
+            True if any test case of the test is one of the stable test cases
+            (analysis depth of the run results is greater than zero) or the test cases in the given status.
+        """
+        tags = {'testrailid={}'.format(case_id) for case_id in self._get_case_ids(test)}
+        if self.results_depth > 0:
+            return bool(tags & self.tr_stable_tags_list)
+        return bool(tags & self.tr_tags_list)
+
+    def _get_shard_tests(self, suite: TestSuite) -> Set[int]:
+        """Get tests of the current shard by longest-processing-time-first algorithm.
+
+        Tests of the TestRail test run are sorted by expected runtime from the longest to the shortest
+        (equal ones by long name and position in the suite, so all workers get the same order)
+        and each test is assigned to the shard with the least total runtime.
+        Tests are selected by the test cases of the test run regardless of their statuses and their runtime
+        is taken only from the results created before the history timestamp (all runtimes are equal without it),
+        so the split doesn't change when the other shards post their results.
+
+        *Args:*\n
+            _suite_ - root Robot Framework test suite object.
+
+        *Returns:*\n
+            Set of identities of the test objects of the current shard.
+        """
+        run_case_ids = {str(test.case_id) for test in self.tr_client.get_test_records(run_id=self.run_id)
+                        if test.case_id is not None}
+        tests = [test for test in self._iter_tests(suite) if run_case_ids.intersection(self._get_case_ids(test))]
+        runtimes = [self._get_runtime(test) if self.history_before else 1.0 for test in tests]
+        weighted_tests = sorted(((runtime, test.longname, position, test)
+                                 for position, (runtime, test) in enumerate(zip(runtimes, tests))),
+                                key=lambda item: (-item[0], item[1], item[2]))
+        loads = [0.0] * cast(int, self.shard_count)
+        shard_tests: Set[int] = set()
+        for runtime, _, _, test in weighted_tests:
+            shard = min(range(len(loads)), key=lambda index: (loads[index], index))
+            loads[shard] += runtime
+            if shard == self.shard_index:
+                shard_tests.add(id(test))
+        return shard_tests
+
+    def _prepare_root_suite(self, suite: TestSuite) -> bool:
+        """Synchronize the test run and select the tests of the current shard from the whole suite tree.
+
+        *Args:*\n
+            _suite_ - root Robot Framework test suite object.
+
+        *Returns:*\n
+            False if the tests of the current shard can't be selected and the suite tree is cleared, else True.
+        """
+        try:
+            if self.sync_run:
+                self._sync_run(suite)
+            if self.shard_count is not None:
+                self._shard_tests = self._get_shard_tests(suite)
+        except (RequestException, TimeoutError) as error:
+            if self.shard_count is None:
+                self._log_to_parent_suite(suite, str(error))
+                return True
+            suite.tests = []
+            suite.suites = []
+            self._log_to_parent_suite(suite, "Tests of shard {index} can't be selected, no tests are executed: "
+                                             "{error}".format(index=self.shard_index, error=error))
+            return False
+        return True
 
     def start_suite(self, suite: TestSuite) -> None:
         """Form list of tests for the Robot Framework test suite that are included in the TestRail test run.
@@ -176,25 +496,38 @@ class TestRailPreRunModifier(SuiteVisitor):
         a list of 'testrailid' tags of all test cases in the given status is obtained.
         After that the list of tags is written to the class attribute and for subsequent suites the obtaining is not happening.
 
+        If test run synchronization is enabled, when the first suite is launched the test cases of the whole
+        suite tree are added to the test run (or a new test run is created) before the tags are obtained.
+
+        If the tests are split into shards, when the first suite is launched the tests of the current shard
+        are selected from the whole suite tree, and only these tests are left in the suites.
+        If the tests of the current shard can't be selected, all tests are removed from the suite tree.
+
         *Args:*\n
             _suite_ - Robot Framework test suite object.
         """
+        if suite.parent is None and not self._prepare_root_suite(suite):
+            return
         tests = suite.tests
         suite.tests = None
         try:
-            if self.results_depth > 0:
-                suite.tests = [t for t in tests if (set(t.tags) & set(self.tr_stable_tags_list))]
-            else:
-                suite.tests = [t for t in tests if (set(t.tags) & set(self.tr_tags_list))]
+            suite.tests = [t for t in tests if self._is_test_in_run(t)]
+            if self._shard_tests is not None:
+                suite.tests = [t for t in suite.tests if id(t) in self._shard_tests]
         except (RequestException, TimeoutError) as error:
             self._log_to_parent_suite(suite, str(error))
 
     def end_suite(self, suite: TestSuite) -> None:
         """Removing test suites that are empty after excluding tests that are not part of the TestRail test run.
 
+        If order of test execution is "failfast", the remaining tests and suites are sorted
+        by the failure probability per second of runtime.
+
         *Args:*\n
             _suite_ - Robot Framework test suite object.
         """
         suite.suites = [s for s in suite.suites if s.test_count > 0]
+        if self.order == ORDER_FAILFAST:
+            self._order_suite(suite)
         if not suite.suites:
             self._log_to_parent_suite(suite, "No tests to execute after using TestRail pre-run modifier.")
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""Export of test statuses of many TestRail test runs and test plans for stability trend reports."""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from requests.exceptions import RequestException
+from TestRailAPIClient import Id, TestRailAPIClient
+
+TREND_COLUMNS = ('case_id', 'run_id', 'status_id', 'elapsed')
+EXPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_MAX_WORKERS = 16  # Number of test runs requested from TestRail concurrently
+
+
+class RunTrend(object):
+    """Columnar statuses of the tests of one TestRail test run.
+
+    Values are kept in typed arrays instead of json dictionaries,
+    so thousands of tests of dozens of test runs take a few megabytes of memory.
+    """
+
+    __slots__ = TREND_COLUMNS
+
+    def __init__(self) -> None:
+        """Create empty RunTrend instance."""
+        self.case_id = array('l')
+        self.run_id = array('l')
+        self.status_id = array('l')
+        self.elapsed = array('l')
+
+    def __len__(self) -> int:
+        """Get number of test statuses.
+
+        *Returns:*\n
+            Number of test statuses.
+        """
+        return len(self.case_id)
+
+    def append(self, case_id: int, run_id: int, status_id: int, elapsed: int) -> None:
+        """Add test status.
+
+        *Args:*\n
+            _case_id_ - ID of the test case;\n
+            _run_id_ - ID of the test run;\n
+            _status_id_ - ID of the test status;\n
+            _elapsed_ - elapsed time of the latest test result in seconds.
+        """
+        self.case_id.append(case_id)
+        self.run_id.append(run_id)
+        self.status_id.append(status_id)
+        self.elapsed.append(elapsed)
+
+    def rows(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Iterate over test statuses.
+
+        *Returns:*\n
+            Iterator of (case_id, run_id, status_id, elapsed) tuples.
+        """
+        return zip(self.case_id, self.run_id, self.status_id, self.elapsed)
+
+
+def fetch_run_trend(client: TestRailAPIClient, run_id: Id) -> RunTrend:
+    """Get statuses of the tests of the test run with elapsed time of their latest results.
+
+    Tests and results of the test run are requested by bulk endpoints, page by page,
+    and aren't cached by the client, so only the columnar statuses are kept.
+
+    *Args:*\n
+        _client_ - TestRail API client;\n
+        _run_id_ - ID of the test run.
+
+    *Returns:*\n
+        Columnar statuses of the tests.
+    """
+    elapsed_by_test_id: Dict[int, int] = {}
+    for result in client.get_result_records(run_id):
+        if result.test_id not in elapsed_by_test_id:
+            elapsed_by_test_id[result.test_id] = result.elapsed
+    trend = RunTrend()
+    for test in client.get_test_records(run_id, cache=False):
+        if test.case_id is not None:
+            trend.append(test.case_id, int(run_id), test.status_id, elapsed_by_test_id.get(test.id, 0))
+    return trend
+
+
+def resolve_run_ids(client: TestRailAPIClient, run_ids: Sequence[Id], plan_ids: Sequence[Id],
+                    max_workers: int = DEFAULT_MAX_WORKERS) -> List[int]:
+    """Get IDs of the test runs and the test runs of all entries of the test plans.
+
+    *Args:*\n
+        _client_ - TestRail API client;\n
+        _run_ids_ - IDs of the test runs;\n
+        _plan_ids_ - IDs of the test plans;\n
+        _max_workers_ - number of the test plans requested concurrently.
+
+    *Returns:*\n
+        List of unique test run IDs.
+    """
+    resolved_run_ids = [int(run_id) for run_id in run_ids]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for plan_run_ids in executor.map(client.get_plan_run_ids, plan_ids):
+            resolved_run_ids.extend(plan_run_ids)
+    return list(dict.fromkeys(resolved_run_ids))
+
+
+def fetch_trend(client: TestRailAPIClient, run_ids: Iterable[Id],
+                max_workers: int = DEFAULT_MAX_WORKERS) -> Iterator[RunTrend]:
+    """Get statuses of the tests of many test runs concurrently.
+
+    Test runs that can't be received are skipped with a warning to the standard error stream.
+
+    *Args:*\n
+        _client_ - TestRail API client;\n
+        _run_ids_ - IDs of the test runs;\n
+        _max_workers_ - number of the test runs requested concurrently.
+
+    *Returns:*\n
+        Iterator of columnar statuses of the test runs in order of their receiving.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_run_trend, client, run_id): run_id for run_id in run_ids}
+        for future in as_completed(futures):
+            try:
+                trend = future.result()
+            except RequestException as error:
+                sys.stderr.write('Test run {run_id} is skipped: {error}\n'.format(run_id=futures[future], error=error))
+                continue
+            yield trend
+
+
+def write_csv(trends: Iterable[RunTrend], stream: IO[str]) -> None:
+    """Write test statuses to the stream in CSV format with header.
+
+    *Args:*\n
+        _trends_ - columnar statuses of the test runs;\n
+        _stream_ - text stream.
+    """
+    writer = csv.writer(stream, lineterminator='\n')
+    writer.writerow(TREND_COLUMNS)
+    for trend in trends:
+        writer.writerows(trend.rows())
+
+
+def write_jsonl(trends: Iterable[RunTrend], stream: IO[str]) -> None:
+    """Write test statuses to the stream in JSON Lines format, one test status per line.
+
+    *Args:*\n
+        _trends_ - columnar statuses of the test runs;\n
+        _stream_ - text stream.
+    """
+    for trend in trends:
+        for row in trend.rows():
+            stream.write(json.dumps(dict(zip(TREND_COLUMNS, row))) + '\n')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Export test statuses of TestRail test runs and test plans from command line.
+
+    *Example:*\n
+    | TESTRAIL_PASSWORD=secret testrail-trend-export --server testrail.local --user tester --run 20 --run 21 --plan 5 --format jsonl --output trend.jsonl
+
+    *Args:*\n
+        _argv_ - command line arguments, by default the arguments of the process.
+    """
+    parser = argparse.ArgumentParser(description='Export test statuses of TestRail test runs and test plans.')
+    parser.add_argument('--server', required=True, help='name of TestRail server')
+    parser.add_argument('--user', required=True, help='name of TestRail user')
+    parser.add_argument('--password', default=os.environ.get('TESTRAIL_PASSWORD'),
+                        help='password of TestRail user, TESTRAIL_PASSWORD environment variable by default')
+    parser.add_argument('--protocol', default='http', choices=('http', 'https'))
+    parser.add_argument('--run', dest='run_ids', action='append', default=[], help='ID of the test run')
+    parser.add_argument('--plan', dest='plan_ids', action='append', default=[], help='ID of the test plan')
+    parser.add_argument('--format', default='csv', choices=EXPORT_FORMATS)
+    parser.add_argument('--output', help='output file, standard output by default')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help='number of test runs requested concurrently')
+    args = parser.parse_args(argv)
+    if args.password is None:
+        parser.error('password of TestRail user is required')
+    if not args.run_ids and not args.plan_ids:
+        parser.error('at least one --run or --plan is required')
+
+    client = TestRailAPIClient(args.server, args.user, args.password, run_id='', protocol=args.protocol)
+    run_ids = resolve_run_ids(client, args.run_ids, args.plan_ids, args.workers)
+    write = write_csv if args.format == 'csv' else write_jsonl
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as stream:
+            write(fetch_trend(client, run_ids, args.workers), stream)
+    else:
+        write(fetch_trend(client, run_ids, args.workers), sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
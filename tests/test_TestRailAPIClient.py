@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from os.path import dirname, join, realpath
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, realpath(join(dirname(__file__), '..', 'src')))
+
+import TestRailAPIClient  # noqa: E402
+
+RUN_ID = '20'
+TESTS = [{'id': 100, 'case_id': 10, 'status_id': 1}, {'id': 101, 'case_id': 11, 'status_id': 5}]
+
+
+class TestRailAPIClientTestCase(unittest.TestCase):
+    """Tests of TestRailAPIClient with mocked http requests."""
+
+    def setUp(self) -> None:
+        self.client = TestRailAPIClient.TestRailAPIClient('host', 'user', 'password', RUN_ID)
+        self.client._send_get = mock.Mock(return_value=TESTS)
+        self.client._send_post = mock.Mock(return_value=[])
+
+    def test_test_records_cached_until_result_is_added(self) -> None:
+        self.client.get_test_records(RUN_ID)
+        self.assertEqual(len(self.client.get_test_records(RUN_ID, status_ids=[5])), 1)
+        self.assertEqual(self.client._send_get.call_count, 1)
+        self.client.add_results_for_cases(RUN_ID, [{'case_id': 10, 'status_id': 5}])
+        self.client.get_test_records(RUN_ID)
+        self.assertEqual(self.client._send_get.call_count, 2)
+
+    def test_test_records_without_cache(self) -> None:
+        self.client.get_test_records(RUN_ID, status_ids=[5], cache=False)
+        self.client.get_test_records(RUN_ID, cache=False)
+        self.assertEqual(self.client._send_get.call_count, 2)
+        self.assertEqual(self.client._send_get.call_args_list[0][1]['params'], {'status_id': '5'})
+        self.assertEqual(self.client._test_records, {})
+
+    def test_test_records_received_during_post_are_not_cached(self) -> None:
+        def send_get(uri: str, headers: dict = None, params: dict = None) -> list:
+            self.client.add_result_for_case(RUN_ID, 10, {'status_id': 5})
+            return TESTS
+
+        self.client._send_get.side_effect = send_get
+        self.client.get_test_records(RUN_ID)
+        self.assertEqual(self.client._test_records, {})
+
+    def test_test_records_dropped_on_post_error(self) -> None:
+        self.client.get_test_records(RUN_ID)
+        self.client._send_post.side_effect = requests.HTTPError('400 Client Error')
+        with self.assertRaises(requests.HTTPError):
+            self.client.add_result_for_case(RUN_ID, 10, {'status_id': 5})
+        self.assertEqual(self.client._test_records, {})
+
+    def _mock_pages(self, items: list, page_size: int) -> list:
+        """Mock bulk endpoint of TestRail 6.7+ returning items by pages, return list of request parameters."""
+        requested_params = []
+
+        def send_get(uri: str, headers: dict = None, params: dict = None) -> dict:
+            requested_params.append(dict(params))
+            offset = params.get('offset', 0)
+            limit = min(params.get('limit', page_size), page_size)
+            next_link = 'next' if offset + limit < len(items) else None
+            return {'offset': offset, 'limit': limit, '_links': {'next': next_link},
+                    'cases': items[offset:offset + limit]}
+
+        self.client._send_get.side_effect = send_get
+        return requested_params
+
+    def test_get_cases_from_several_pages(self) -> None:
+        cases = [{'id': case_id} for case_id in range(5)]
+        requested_params = self._mock_pages(cases, 2)
+        self.assertEqual(self.client.get_cases(1, suite_id=2, type_id=[1, 3]), cases)
+        self.assertEqual([params.get('offset') for params in requested_params], [None, 2, 4])
+        self.assertEqual(requested_params[0]['type_id'], '1,3')
+
+    def test_get_cases_limit_across_pages(self) -> None:
+        cases = [{'id': case_id} for case_id in range(6)]
+        requested_params = self._mock_pages(cases, 2)
+        self.assertEqual(self.client.get_cases(1, limit=3), cases[:3])
+        self.assertEqual([(params.get('offset'), int(params['limit'])) for params in requested_params],
+                         [(None, 3), (2, 1)])
+
+    def test_get_cases_from_server_without_pagination(self) -> None:
+        cases = [{'id': case_id} for case_id in range(3)]
+        self.client._send_get.return_value = cases
+        self.assertEqual(self.client.get_cases(1), cases)
+        self.client._send_get.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+import unittest
+from concurrent.futures import wait
+from fnmatch import fnmatch
+from os.path import dirname, join, realpath
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, realpath(join(dirname(__file__), '..', 'src')))
+
+import TestRailAPIClient  # noqa: E402
+import TestRailListener  # noqa: E402
+
+RUN_ID = '20'
+TESTRAIL_STATUS_ID_BLOCKED = 2
+
+
+class TestRailListenerTestCase(unittest.TestCase):
+    """Tests of TestRailListener with mocked TestRail client."""
+
+    def setUp(self) -> None:
+        self.client = mock.Mock()
+        self.client.get_test_records.return_value = [TestRailAPIClient.TestRecord(10, 10, 1)]
+        self.client.get_test_status_id_by_case_id.return_value = None
+        self.client.get_case_fields.return_value = [{'system_name': 'custom_case_description'}]
+        self.client.update_case.return_value = {}
+        patcher = mock.patch.object(TestRailListener, 'get_shared_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _create_listener(**options: str) -> TestRailListener.TestRailListener:
+        """Create listener for the mocked test run, start the root suite and wait for the warm-up."""
+        listener = TestRailListener.TestRailListener('host', 'user', 'password', RUN_ID, 'http', **options)
+        listener.start_suite('Suite', {'id': 's1'})
+        wait(listener._warm_up_futures.values())
+        return listener
+
+    @staticmethod
+    def _end_test(listener: TestRailListener.TestRailListener, name: str, status: str, *tags: str) -> None:
+        """Finish the test in the listener."""
+        listener.end_test(name, {'longname': 'Suite.' + name, 'status': status, 'tags': list(tags), 'doc': '',
+                                 'elapsedtime': 1000, 'message': ''})
+
+    def _get_posted_case_ids(self) -> list:
+        """Get case IDs of the results posted with bulk requests."""
+        return [result['case_id'] for call in self.client.add_results_for_cases.call_args_list
+                for result in call[0][1]]
+
+    def test_warm_up_requests(self) -> None:
+        listener = self._create_listener()
+        self.assertEqual(set(listener._warm_up_futures), {'tests', 'case_fields'})
+        self.client.get_statuses.assert_not_called()
+
+    def test_statuses_posted_before_warm_up_is_finished(self) -> None:
+        warm_up_released = threading.Event()
+
+        def get_test_records(run_id: str) -> list:
+            warm_up_released.wait(5)
+            return [TestRailAPIClient.TestRecord(10, 10, TESTRAIL_STATUS_ID_BLOCKED)]
+
+        self.client.get_test_records.side_effect = get_test_records
+        self.client.get_test_status_id_by_case_id.return_value = TESTRAIL_STATUS_ID_BLOCKED
+        listener = TestRailListener.TestRailListener('host', 'user', 'password', RUN_ID, 'http')
+        listener.start_suite('Suite', {'id': 's1'})
+        self._end_test(listener, 'Test 1', 'PASS', 'testrailid=10')
+        warm_up_released.set()
+        wait(listener._warm_up_futures.values())
+        self._end_test(listener, 'Test 2', 'FAIL', 'testrailid=10')
+        self.assertEqual([call[0][2]['status_id'] for call in self.client.add_result_for_case.call_args_list],
+                         [listener.TESTRAIL_TEST_STATUS_ID_PASSED, listener.TESTRAIL_TEST_STATUS_ID_FAILED])
+
+    def test_aggregated_skipped_case_without_results(self) -> None:
+        listener = self._create_listener(aggregate='True')
+        self._end_test(listener, 'Test 1', 'SKIP', 'testrailid=11')
+        self._end_test(listener, 'Test 2', 'PASS', 'testrailid=10')
+        listener.end_suite('Suite', {'id': 's1'})
+        self.assertEqual(self._get_posted_case_ids(), ['10'])
+
+    def test_several_case_ids_with_case_missing_in_run(self) -> None:
+        listener = self._create_listener()
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10,12', 'testrailid=13')
+        self.client.add_result_for_case.assert_called_once()
+        self.assertEqual(self.client.add_result_for_case.call_args[0][:2], (RUN_ID, '10'))
+        self.client.add_results_for_cases.assert_not_called()
+
+    def test_several_case_ids_posted_one_by_one_on_error(self) -> None:
+        self.client.get_test_records.side_effect = requests.ConnectionError('Connection error')
+        self.client.add_results_for_cases.side_effect = requests.HTTPError('400 Client Error')
+        listener = self._create_listener()
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10,12')
+        self.assertEqual([call[0][1] for call in self.client.add_result_for_case.call_args_list], ['10', '12'])
+
+    def test_several_case_ids_with_failed_status_lookup(self) -> None:
+        def get_test_status_id_by_case_id(run_id: str, case_id: str) -> None:
+            if case_id == '12':
+                raise requests.HTTPError('400 Client Error')
+
+        self.client.get_test_records.side_effect = requests.ConnectionError('Connection error')
+        self.client.get_test_status_id_by_case_id.side_effect = get_test_status_id_by_case_id
+        listener = self._create_listener()
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10,12')
+        self.assertEqual([call[0][1] for call in self.client.add_result_for_case.call_args_list], ['10'])
+        self.client.add_results_for_cases.assert_not_called()
+
+    def test_update_of_first_case_only(self) -> None:
+        self.client.get_test_records.return_value = [TestRailAPIClient.TestRecord(case_id, case_id, 1)
+                                                     for case_id in (10, 11)]
+        listener = self._create_listener(update='True')
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10,11')
+        self.assertEqual([call[0][0] for call in self.client.update_case.call_args_list], ['10'])
+
+    def test_report_link_matches_comma_separated_tags(self) -> None:
+        listener = self._create_listener()
+        listener._vars_for_report_link = {'JENKINS_BUILD_URL': 'http://jenkins/job/1/'}
+        include = listener._get_url_report_by_case_id('11').split('include=')[1]
+        tag_patterns = include.split('OR')
+        for tag in ('testrailid=11', 'testrailid=10,11', 'testrailid=11,12', 'testrailid=10,11,12'):
+            self.assertTrue(any(fnmatch(tag, pattern) for pattern in tag_patterns), tag)
+        for tag in ('testrailid=110', 'testrailid=10,110', 'testrailid=111,12'):
+            self.assertFalse(any(fnmatch(tag, pattern) for pattern in tag_patterns), tag)
+
+    def test_plan_batch_with_skipped_case_without_results(self) -> None:
+        self.client.get_plan_run_ids.return_value = [20, 21]
+        self.client.get_test_records.return_value = [TestRailAPIClient.TestRecord(10, 10, 1),
+                                                     TestRailAPIClient.TestRecord(11, 11, 3)]
+        listener = self._create_listener(plan_id='30')
+        self._end_test(listener, 'Test 1', 'SKIP', 'testrailid=11')
+        self._end_test(listener, 'Test 2', 'PASS', 'testrailid=10')
+        listener.end_suite('Suite', {'id': 's1'})
+        self.assertEqual(self._get_posted_case_ids(), ['10', '10'])
+
+    def test_plan_results_kept_until_warm_up_succeeds(self) -> None:
+        self.client.get_plan_run_ids.side_effect = [requests.ConnectionError('Connection error')] * 2 + [[20]]
+        listener = self._create_listener(plan_id='30')
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10')
+        listener.end_suite('Child', {'id': 's1-s1'})
+        self.client.add_results_for_cases.assert_not_called()
+        listener.end_suite('Suite', {'id': 's1'})
+        self.assertEqual(self._get_posted_case_ids(), ['10'])
+
+    def test_plan_results_dropped_at_end_of_run_on_warm_up_failure(self) -> None:
+        self.client.get_plan_run_ids.side_effect = requests.ConnectionError('Connection error')
+        listener = self._create_listener(plan_id='30')
+        self._end_test(listener, 'Test', 'PASS', 'testrailid=10')
+        with mock.patch.object(TestRailListener.logger, 'error') as error:
+            listener.end_suite('Child', {'id': 's1-s1'})
+            listener.end_suite('Suite', {'id': 's1'})
+        self.assertEqual(error.call_count, 2)
+        self.assertEqual(listener._plan_results, [])
+        self.client.add_results_for_cases.assert_not_called()
+
+    def test_profiler_percentiles_by_nearest_rank(self) -> None:
+        percentile = TestRailListener.ListenerProfiler._percentile
+        values = [float(value) for value in range(1, 11)]
+        self.assertEqual([percentile(values, percent) for percent in (0, 10, 50, 90, 99, 100)],
+                         [1.0, 1.0, 5.0, 9.0, 10.0, 10.0])
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual([percentile(values, percent) for percent in (50, 90, 99)], [50.0, 90.0, 99.0])
+        self.assertEqual(percentile([7.0], 50), 7.0)
+
+    def test_profiled_tests_excluded_from_timings(self) -> None:
+        profiler = TestRailListener.ListenerProfiler(enabled=True, stacks_count=1)
+        for number in range(profiler.STACKS_SAMPLE_INTERVAL + 1):
+            with profiler.test(f'Suite.Test {number}'), profiler.phase('post'):
+                pass
+        self.assertEqual(len(profiler._timings['post']), profiler.STACKS_SAMPLE_INTERVAL - 1)
+        self.assertEqual(len(profiler._slowest_stacks), 1)
+        self.assertNotIn('Suite.Test 0', [test_name for _, test_name in profiler._slowest_tests])
+
+    def test_result_posted_when_profiling_can_not_be_started(self) -> None:
+        listener = self._create_listener(profile='profile.txt', profile_stacks='1')
+        with mock.patch.object(TestRailListener.cProfile.Profile, 'enable',
+                               side_effect=ValueError('Another profiling tool is already active')):
+            self._end_test(listener, 'Test', 'PASS', 'testrailid=10')
+        self.client.add_result_for_case.assert_called_once()
+        self.assertEqual(listener._profiler.stacks_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
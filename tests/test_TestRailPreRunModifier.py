@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import unittest
+from os.path import dirname, join, realpath
+from unittest import mock
+
+from requests.exceptions import RequestException
+from robot import running
+
+sys.path.insert(0, realpath(join(dirname(__file__), '..', 'src')))
+
+import TestRailPreRunModifier  # noqa: E402
+import TestRailAPIClient  # noqa: E402
+
+RUN_CASE_IDS = (10, 11, 12, 13)
+TESTRAIL_STATUS_ID_FAILED = 5
+
+
+class TestRailPreRunModifierTestCase(unittest.TestCase):
+    """Tests of TestRailPreRunModifier with mocked TestRail client."""
+
+    def setUp(self) -> None:
+        self.statuses = {case_id: TESTRAIL_STATUS_ID_FAILED for case_id in RUN_CASE_IDS}
+        self.client = mock.Mock()
+        self.client.get_test_records.side_effect = self._get_test_records
+        self.client.get_result_records.return_value = [
+            TestRailAPIClient.ResultRecord(case_id, TESTRAIL_STATUS_ID_FAILED, case_id) for case_id in RUN_CASE_IDS]
+        self.client.get_status_id_by_status_label.return_value = TESTRAIL_STATUS_ID_FAILED
+        patcher = mock.patch.object(TestRailPreRunModifier, 'get_shared_client', return_value=self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _get_test_records(self, run_id: str, status_ids: list = None) -> list:
+        """Get tests of the mocked test run in the given statuses."""
+        return [TestRailAPIClient.TestRecord(case_id, case_id, status_id)
+                for case_id, status_id in self.statuses.items() if status_ids is None or status_id in status_ids]
+
+    @staticmethod
+    def _create_suite(*case_ids: str) -> running.TestSuite:
+        """Create single-file suite with one test per case ID."""
+        suite = running.TestSuite(name='Suite')
+        for case_id in case_ids:
+            suite.tests.create(name='Test {}'.format(case_id), tags=['testrailid={}'.format(case_id)])
+        return suite
+
+    def _run_shard(self, shard_index: int, shard_count: int, **options: str) -> list:
+        """Apply modifier for the shard to a new suite and get names of the remaining tests."""
+        suite = self._create_suite('10', '11', '12', '13', '14')
+        suite.visit(TestRailPreRunModifier.TestRailPreRunModifier(
+            'host', 'user', 'password', '20', 'http', '0', 'failed',
+            shard_index=str(shard_index), shard_count=str(shard_count), **options))
+        return [test.name for test in suite.all_tests]
+
+    def test_shards_of_single_file_suite(self) -> None:
+        shards = [self._run_shard(index, 2) for index in range(2)]
+        self.assertTrue(all(shards))
+        self.assertEqual(sorted(shards[0] + shards[1]), ['Test 10', 'Test 11', 'Test 12', 'Test 13'])
+
+    def test_shards_do_not_depend_on_test_statuses(self) -> None:
+        shards = [self._run_shard(index, 2) for index in range(2)]
+        self.statuses[10] = self.statuses[11] = TestRailAPIClient.TESTRAIL_STATUS_ID_PASSED
+        for index, shard in enumerate(shards):
+            self.assertEqual(self._run_shard(index, 2), [name for name in shard if name not in ('Test 10', 'Test 11')])
+
+    def test_failfast_order_of_tests_and_suites(self) -> None:
+        passed, failed = TestRailAPIClient.TESTRAIL_STATUS_ID_PASSED, TESTRAIL_STATUS_ID_FAILED
+        self.client.get_result_records.return_value = [
+            TestRailAPIClient.ResultRecord(test_id, status_id, elapsed)
+            for test_id, status_id, elapsed in ((10, passed, 10), (11, failed, 10), (12, failed, 1)) for _ in range(3)]
+        suite = running.TestSuite(name='Suite')
+        for child_name, case_ids in (('Stable', ('10', '11')), ('Unknown', ('13', '12'))):
+            child = suite.suites.create(name=child_name)
+            for case_id in case_ids:
+                child.tests.create(name='Test {}'.format(case_id), tags=['testrailid={}'.format(case_id)])
+        suite.visit(TestRailPreRunModifier.TestRailPreRunModifier(
+            'host', 'user', 'password', '20', 'http', '0', order='failfast', history_depth='3'))
+        self.assertEqual([child.name for child in suite.suites], ['Unknown', 'Stable'])
+        self.assertEqual([test.name for test in suite.all_tests], ['Test 12', 'Test 13', 'Test 11', 'Test 10'])
+
+    def test_history_depth_independent_of_results_depth(self) -> None:
+        modifier = TestRailPreRunModifier.TestRailPreRunModifier(
+            'host', 'user', 'password', '20', 'http', '2', order='failfast')
+        self.assertEqual(modifier.history_depth, TestRailPreRunModifier.DEFAULT_HISTORY_DEPTH)
+        self.client.get_result_records.return_value = [
+            TestRailAPIClient.ResultRecord(10, TESTRAIL_STATUS_ID_FAILED, 1) for _ in range(5)]
+        self.assertEqual(len(modifier.tr_history['10']), 5)
+
+    def test_shards_do_not_depend_on_results_posted_after_history_timestamp(self) -> None:
+        results = [(100, TestRailAPIClient.ResultRecord(case_id, TESTRAIL_STATUS_ID_FAILED, elapsed))
+                   for case_id, elapsed in ((10, 40), (11, 30), (12, 20), (13, 10))]
+
+        def get_result_records(run_id: str, created_before: int = None) -> list:
+            return [result for created_on, result in results if created_before is None or created_on < created_before]
+
+        self.client.get_result_records.side_effect = get_result_records
+        first_shard = self._run_shard(0, 2, history_before='200')
+        self.assertEqual(first_shard, ['Test 10', 'Test 13'])
+        results.insert(0, (300, TestRailAPIClient.ResultRecord(13, TESTRAIL_STATUS_ID_FAILED, 1000)))
+        self.assertEqual(self._run_shard(1, 2, history_before='200'), ['Test 11', 'Test 12'])
+        self.assertEqual(self._run_shard(0, 2, history_before='200'), first_shard)
+
+    def test_shards_without_history_timestamp_are_balanced_by_number_of_tests(self) -> None:
+        shards = [self._run_shard(index, 2) for index in range(2)]
+        self.assertEqual([len(shard) for shard in shards], [2, 2])
+        self.client.get_result_records.assert_not_called()
+
+    def test_run_can_not_be_created_by_shards(self) -> None:
+        with self.assertRaises(ValueError):
+            TestRailPreRunModifier.TestRailPreRunModifier(
+                'host', 'user', 'password', '', 'http', '0', sync_run='True', project_id='1',
+                shard_index='0', shard_count='2')
+
+    def test_sync_run_of_single_file_suite(self) -> None:
+        suite = self._create_suite('10', '14')
+        suite.visit(TestRailPreRunModifier.TestRailPreRunModifier(
+            'host', 'user', 'password', '20', 'http', '0', sync_run='True'))
+        self.client.update_run.assert_called_once_with('20', [10, 11, 12, 13, 14])
+
+    def test_create_run_for_single_file_suite(self) -> None:
+        self.client.add_run.return_value = {'id': 30}
+        suite = self._create_suite('10', '14')
+        with mock.patch.dict(TestRailPreRunModifier.os.environ), \
+                mock.patch.object(TestRailPreRunModifier, 'share_client'):
+            suite.visit(TestRailPreRunModifier.TestRailPreRunModifier(
+                'host', 'user', 'password', '', 'http', '0', sync_run='True', project_id='1'))
+            self.assertEqual(TestRailPreRunModifier.os.environ[TestRailAPIClient.TESTRAIL_RUN_ID_ENV_VAR], '30')
+        self.client.add_run.assert_called_once_with('1', 'Suite', [10, 14], suite_id=None)
+
+    def test_no_tests_on_shard_prefetch_failure(self) -> None:
+        self.client.get_test_records.side_effect = RequestException('Connection error')
+        self.assertEqual(self._run_shard(0, 2), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
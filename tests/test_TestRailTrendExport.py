@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import sys
+import unittest
+from os.path import dirname, join, realpath
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, realpath(join(dirname(__file__), '..', 'src')))
+
+import TestRailAPIClient  # noqa: E402
+import TestRailTrendExport  # noqa: E402
+
+
+class TestRailTrendExportTestCase(unittest.TestCase):
+    """Tests of TestRailTrendExport with mocked TestRail client."""
+
+    def setUp(self) -> None:
+        self.client = mock.Mock()
+        self.client.get_test_records.return_value = [
+            TestRailAPIClient.TestRecord(100, 10, 1), TestRailAPIClient.TestRecord(101, 11, 5),
+            TestRailAPIClient.TestRecord(102, None, 3)]
+        self.client.get_result_records.return_value = [
+            TestRailAPIClient.ResultRecord(101, 5, 30), TestRailAPIClient.ResultRecord(100, 1, 10),
+            TestRailAPIClient.ResultRecord(101, 1, 20), TestRailAPIClient.ResultRecord(102, 3, 5)]
+
+    @staticmethod
+    def _create_trend() -> TestRailTrendExport.RunTrend:
+        """Create columnar statuses of two tests."""
+        trend = TestRailTrendExport.RunTrend()
+        trend.append(10, 20, 1, 10)
+        trend.append(11, 20, 5, 0)
+        return trend
+
+    def test_fetch_run_trend(self) -> None:
+        trend = TestRailTrendExport.fetch_run_trend(self.client, '20')
+        self.assertEqual(list(trend.rows()), [(10, 20, 1, 10), (11, 20, 5, 30)])
+        self.assertEqual(len(trend), 2)
+        self.client.get_test_records.assert_called_once_with('20', cache=False)
+
+    def test_resolve_run_ids_without_duplicates(self) -> None:
+        self.client.get_plan_run_ids.side_effect = lambda plan_id: {'5': [21, 22], '6': [22, 20]}[plan_id]
+        run_ids = TestRailTrendExport.resolve_run_ids(self.client, ['20', 21], ['5', '6'])
+        self.assertEqual(run_ids, [20, 21, 22])
+
+    def test_fetch_trend_skips_failed_run(self) -> None:
+        def get_test_records(run_id: str, cache: bool = True) -> list:
+            if run_id == 21:
+                raise requests.HTTPError('400 Client Error')
+            return [TestRailAPIClient.TestRecord(100, 10, 1)]
+
+        self.client.get_test_records.side_effect = get_test_records
+        with mock.patch.object(TestRailTrendExport.sys, 'stderr', io.StringIO()) as stderr:
+            trends = list(TestRailTrendExport.fetch_trend(self.client, [20, 21, 22]))
+        self.assertEqual(sorted(trend.run_id[0] for trend in trends), [20, 22])
+        self.assertIn('Test run 21 is skipped', stderr.getvalue())
+
+    def test_write_csv(self) -> None:
+        stream = io.StringIO()
+        TestRailTrendExport.write_csv([self._create_trend()], stream)
+        self.assertEqual(stream.getvalue(), 'case_id,run_id,status_id,elapsed\n10,20,1,10\n11,20,5,0\n')
+
+    def test_write_jsonl(self) -> None:
+        stream = io.StringIO()
+        TestRailTrendExport.write_jsonl([self._create_trend()], stream)
+        self.assertEqual([json.loads(line) for line in stream.getvalue().splitlines()], [
+            {'case_id': 10, 'run_id': 20, 'status_id': 1, 'elapsed': 10},
+            {'case_id': 11, 'run_id': 20, 'status_id': 5, 'elapsed': 0}])
+
+
+if __name__ == '__main__':
+    unittest.main()